@@ -5,8 +5,9 @@ import asyncio
 
 from config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASS
 
-from db.db_init import Base
+from db.db_config import Base
 from models.tables.application import Application
+from models.tables.backup import BackupCatalog
 from models.tables.course import Course
 from models.tables.group import Group
 from models.tables.journal import Journal
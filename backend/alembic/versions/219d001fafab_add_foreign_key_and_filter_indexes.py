@@ -0,0 +1,53 @@
+"""add_foreign_key_and_filter_indexes
+
+Revision ID: 219d001fafab
+Revises: e49098b7d1b7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '219d001fafab'
+down_revision: Union[str, None] = 'e49098b7d1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_task_course_id', 'task', ['course_id']),
+    ('ix_group_course_id', 'group', ['course_id']),
+    ('ix_journal_task_id', 'journal', ['task_id']),
+    ('ix_journal_user_id', 'journal', ['user_id']),
+    ('ix_application_course_id', 'application', ['course_id']),
+    ('ix_application_status', 'application', ['status']),
+    ('ix_course_status', 'course', ['status']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+        op.create_index('ix_course_active_id', 'course', ['id'], unique=False,
+                        postgresql_where=sa.text("status = 'active'"),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_course_active_id', table_name='course',
+                      postgresql_concurrently=True, if_exists=True)
+
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table,
+                          postgresql_concurrently=True, if_exists=True)
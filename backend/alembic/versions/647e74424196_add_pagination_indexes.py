@@ -0,0 +1,28 @@
+"""add_pagination_indexes
+
+Revision ID: 647e74424196
+Revises: 902439599c98
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '647e74424196'
+down_revision: Union[str, None] = '902439599c98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ключ курсорной пагинации заявок (application_date, id)
+    op.create_index('ix_application_application_date_id', 'application', ['application_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_application_date_id', table_name='application')
@@ -1,7 +1,7 @@
 """add_oauth_fields_to_user
 
 Revision ID: 902439599c98
-Revises: 
+Revises: f5ba5fa0d1a1
 Create Date: 2025-03-21 00:47:07.580856
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '902439599c98'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = 'f5ba5fa0d1a1'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
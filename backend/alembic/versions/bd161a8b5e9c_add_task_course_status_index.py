@@ -0,0 +1,37 @@
+"""add_task_course_status_index
+
+Revision ID: bd161a8b5e9c
+Revises: 219d001fafab
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd161a8b5e9c'
+down_revision: Union[str, None] = '219d001fafab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Составной индекс покрывает и внешний ключ course_id,
+    # поэтому отдельный ix_task_course_id больше не нужен
+    with op.get_context().autocommit_block():
+        op.create_index('ix_task_course_id_status_id', 'task', ['course_id', 'status', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_task_course_id', table_name='task',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_task_course_id', 'task', ['course_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_task_course_id_status_id', table_name='task',
+                      postgresql_concurrently=True, if_exists=True)
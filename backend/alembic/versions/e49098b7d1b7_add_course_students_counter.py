@@ -0,0 +1,76 @@
+"""add_course_students_counter
+
+Revision ID: e49098b7d1b7
+Revises: ed0006640394
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e49098b7d1b7'
+down_revision: Union[str, None] = 'ed0006640394'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# course.students_count - денормализованный счётчик записей group.
+# Триггеры уровня оператора: массовое зачисление обновляет строку курса
+# один раз, а не на каждого студента
+COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION course_students_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE course c SET students_count = c.students_count + d.cnt
+        FROM (SELECT course_id, count(*) AS cnt FROM new_rows GROUP BY course_id) d
+        WHERE c.id = d.course_id;
+    ELSE
+        UPDATE course c SET students_count = c.students_count - d.cnt
+        FROM (SELECT course_id, count(*) AS cnt FROM old_rows GROUP BY course_id) d
+        WHERE c.id = d.course_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    ('course_students_counter_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('course_students_counter_delete', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+RECOUNT = """
+UPDATE course c SET students_count = (SELECT count(*) FROM "group" g WHERE g.course_id = c.id)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(COUNTER_FUNCTION)
+    for name, event, referencing in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON "group" '
+            f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION course_students_counter()"
+        )
+
+    # Значение, введённое администратором, заменяется реальным количеством
+    op.execute(RECOUNT)
+    op.alter_column('course', 'students_count',
+                    existing_type=sa.Integer(),
+                    nullable=False,
+                    server_default='0')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('course', 'students_count',
+                    existing_type=sa.Integer(),
+                    nullable=True,
+                    server_default=None)
+    for name, _, _ in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON "group"')
+    op.execute("DROP FUNCTION IF EXISTS course_students_counter()")
@@ -0,0 +1,174 @@
+"""add_course_stats
+
+Revision ID: ed0006640394
+Revises: c535ab39400d
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed0006640394'
+down_revision: Union[str, None] = 'c535ab39400d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Пересчёт статистики с нуля (используется при миграции и для ремонта данных)
+REBUILD_FUNCTION = """
+CREATE OR REPLACE FUNCTION course_stats_rebuild() RETURNS void AS $$
+BEGIN
+    INSERT INTO course_stats (course_id, tasks_closed, tasks_in_process, tasks_done, tasks_deleted, marks_sum, marks_count)
+    SELECT
+        c.id,
+        (SELECT count(*) FROM task t WHERE t.course_id = c.id AND t.status = 'closed'),
+        (SELECT count(*) FROM task t WHERE t.course_id = c.id AND t.status = 'inProcess'),
+        (SELECT count(*) FROM task t WHERE t.course_id = c.id AND t.status = 'done'),
+        (SELECT count(*) FROM task t WHERE t.course_id = c.id AND t.status = 'deleted'),
+        (SELECT coalesce(sum(j.mark), 0) FROM journal j JOIN task t ON t.id = j.task_id WHERE t.course_id = c.id AND j.mark > 0),
+        (SELECT count(*) FROM journal j JOIN task t ON t.id = j.task_id WHERE t.course_id = c.id AND j.mark > 0)
+    FROM course c
+    ON CONFLICT (course_id) DO UPDATE SET
+        tasks_closed = EXCLUDED.tasks_closed,
+        tasks_in_process = EXCLUDED.tasks_in_process,
+        tasks_done = EXCLUDED.tasks_done,
+        tasks_deleted = EXCLUDED.tasks_deleted,
+        marks_sum = EXCLUDED.marks_sum,
+        marks_count = EXCLUDED.marks_count;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+COURSE_FUNCTION = """
+CREATE OR REPLACE FUNCTION course_stats_course() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO course_stats (course_id) SELECT id FROM new_rows ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Триггеры уровня оператора с transition-таблицами: массовые вставки
+# обновляют строку статистики один раз на курс, а не на каждую запись
+TASK_FUNCTION = """
+CREATE OR REPLACE FUNCTION course_stats_task() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE course_stats s SET
+            tasks_closed = s.tasks_closed - d.closed,
+            tasks_in_process = s.tasks_in_process - d.in_process,
+            tasks_done = s.tasks_done - d.done,
+            tasks_deleted = s.tasks_deleted - d.deleted
+        FROM (
+            SELECT course_id,
+                   count(*) FILTER (WHERE status = 'closed') AS closed,
+                   count(*) FILTER (WHERE status = 'inProcess') AS in_process,
+                   count(*) FILTER (WHERE status = 'done') AS done,
+                   count(*) FILTER (WHERE status = 'deleted') AS deleted
+            FROM old_rows GROUP BY course_id
+        ) d
+        WHERE s.course_id = d.course_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        UPDATE course_stats s SET
+            tasks_closed = s.tasks_closed + d.closed,
+            tasks_in_process = s.tasks_in_process + d.in_process,
+            tasks_done = s.tasks_done + d.done,
+            tasks_deleted = s.tasks_deleted + d.deleted
+        FROM (
+            SELECT course_id,
+                   count(*) FILTER (WHERE status = 'closed') AS closed,
+                   count(*) FILTER (WHERE status = 'inProcess') AS in_process,
+                   count(*) FILTER (WHERE status = 'done') AS done,
+                   count(*) FILTER (WHERE status = 'deleted') AS deleted
+            FROM new_rows GROUP BY course_id
+        ) d
+        WHERE s.course_id = d.course_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Оценка 0 - заглушка при зачислении, в среднее попадают только выставленные
+JOURNAL_FUNCTION = """
+CREATE OR REPLACE FUNCTION course_stats_journal() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE course_stats s SET
+            marks_sum = s.marks_sum - d.total,
+            marks_count = s.marks_count - d.cnt
+        FROM (
+            SELECT t.course_id, sum(o.mark) AS total, count(*) AS cnt
+            FROM old_rows o JOIN task t ON t.id = o.task_id
+            WHERE o.mark > 0
+            GROUP BY t.course_id
+        ) d
+        WHERE s.course_id = d.course_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        UPDATE course_stats s SET
+            marks_sum = s.marks_sum + d.total,
+            marks_count = s.marks_count + d.cnt
+        FROM (
+            SELECT t.course_id, sum(n.mark) AS total, count(*) AS cnt
+            FROM new_rows n JOIN task t ON t.id = n.task_id
+            WHERE n.mark > 0
+            GROUP BY t.course_id
+        ) d
+        WHERE s.course_id = d.course_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    ('course_stats_course_insert', 'course', 'INSERT', 'NEW TABLE AS new_rows', 'course_stats_course'),
+    ('course_stats_task_insert', 'task', 'INSERT', 'NEW TABLE AS new_rows', 'course_stats_task'),
+    ('course_stats_task_update', 'task', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows', 'course_stats_task'),
+    ('course_stats_task_delete', 'task', 'DELETE', 'OLD TABLE AS old_rows', 'course_stats_task'),
+    ('course_stats_journal_insert', 'journal', 'INSERT', 'NEW TABLE AS new_rows', 'course_stats_journal'),
+    ('course_stats_journal_update', 'journal', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows', 'course_stats_journal'),
+    ('course_stats_journal_delete', 'journal', 'DELETE', 'OLD TABLE AS old_rows', 'course_stats_journal'),
+]
+
+FUNCTIONS = ['course_stats_course', 'course_stats_task', 'course_stats_journal', 'course_stats_rebuild']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_stats',
+        sa.Column('course_id', sa.Integer(), sa.ForeignKey('course.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('tasks_closed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_in_process', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_done', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_deleted', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('marks_sum', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('marks_count', sa.Integer(), server_default='0', nullable=False),
+    )
+
+    for function in (REBUILD_FUNCTION, COURSE_FUNCTION, TASK_FUNCTION, JOURNAL_FUNCTION):
+        op.execute(function)
+
+    for name, table, event, referencing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+            f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+
+    op.execute("SELECT course_stats_rebuild()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    for function in FUNCTIONS:
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+    op.drop_table('course_stats')
@@ -0,0 +1,118 @@
+"""create_base_schema
+
+Revision ID: f5ba5fa0d1a1
+Revises: 
+Create Date: 2025-03-21 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5ba5fa0d1a1'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Исходная схема, которую раньше создавал Base.metadata.create_all.
+# Базы из backups/qitc_db_backup_20250321_013820.dump уже на ревизии 902439599c98,
+# для них эта миграция не выполняется
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(length=254), nullable=False),
+        sa.Column('password', sa.String(), nullable=False),
+        sa.Column('role', sa.Enum('user', 'student', 'admin', name='user_role'), nullable=False),
+        sa.Column('user_date_auth', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+    op.create_index('ix_user_id', 'user', ['id'], unique=False)
+
+    op.create_table(
+        'crl',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('token', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_crl_id', 'crl', ['id'], unique=False)
+    op.create_index('ix_crl_token', 'crl', ['token'], unique=False)
+
+    op.create_table(
+        'course',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('students_count', sa.Integer(), nullable=True),
+        sa.Column('status', sa.Enum('active', 'closed', 'deleted', name='course_status'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'task',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('status', sa.Enum('closed', 'inProcess', 'done', 'deleted', name='task_status'), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['course.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'group',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['course.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+
+    op.create_table(
+        'journal',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('mark', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['task.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id', 'user_id', 'task_id')
+    )
+
+    op.create_table(
+        'application',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_name', sa.String(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('readed', 'new', name='application_status'), nullable=False),
+        sa.Column('application_date', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('application')
+    op.drop_table('journal')
+    op.drop_table('group')
+    op.drop_table('task')
+    op.drop_table('course')
+    op.drop_index('ix_crl_token', table_name='crl')
+    op.drop_index('ix_crl_id', table_name='crl')
+    op.drop_table('crl')
+    op.drop_index('ix_user_id', table_name='user')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_table('user')
+    for enum_name in ('application_status', 'task_status', 'course_status', 'user_role'):
+        postgresql.ENUM(name=enum_name).drop(op.get_bind(), checkfirst=True)
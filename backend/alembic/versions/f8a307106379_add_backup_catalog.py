@@ -0,0 +1,42 @@
+"""add_backup_catalog
+
+Revision ID: f8a307106379
+Revises: bd161a8b5e9c
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8a307106379'
+down_revision: Union[str, None] = 'bd161a8b5e9c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'backup_catalog',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('backup_file', sa.String(), nullable=False),
+        sa.Column('backup_format', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('pg_dump_version', sa.String(), nullable=True),
+        sa.Column('table_rows', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('backup_file')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('backup_catalog')
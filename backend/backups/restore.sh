@@ -1,6 +1,9 @@
 #!/bin/bash
 set -e
 
+# Признак завершения восстановления для healthcheck в docker-compose
+rm -f /tmp/restore_done
+
 until pg_isready -h localhost -U $POSTGRES_USER; do
   echo "Waiting for PostgreSQL to start..."
   sleep 1
@@ -16,4 +19,6 @@ if [ -f /backups/qitc_db_backup_20250321_013820.dump ]; then
   echo "Database restored successfully!"
 else
   echo "No backup file found. Skipping restoration."
-fi
\ No newline at end of file
+fi
+
+touch /tmp/restore_done
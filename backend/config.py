@@ -17,6 +17,45 @@ DB_PASS = os.environ.get("DB_PASS")
 
 assert all([DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASS]), "Database configuration is incomplete"
 
+# Режим работы приложения: development | production
+APP_ENV = os.environ.get("APP_ENV", "development")
+
+# Пул соединений и логирование SQL
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 100))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 0))
+DB_ECHO = os.environ.get("DB_ECHO", "false" if APP_ENV == "production" else "true").lower() in ("1", "true", "yes")
+DB_QUERY_LOG_SAMPLE_RATE = float(os.environ.get("DB_QUERY_LOG_SAMPLE_RATE", 0))
+
+# Время жизни кэша публичного каталога курсов (0 - без кэша)
+ACTIVE_COURSES_CACHE_SECONDS = float(os.environ.get("ACTIVE_COURSES_CACHE_SECONDS", 0))
+
+# Резервные копии
+BACKUP_DIR = os.environ.get("BACKUP_DIR", "backups")
+BACKUP_STREAM_CHUNK_SIZE = int(os.environ.get("BACKUP_STREAM_CHUNK_SIZE", 64 * 1024))
+# Максимум параллельных процессов pg_dump/pg_restore (-j) на один запрос
+BACKUP_MAX_JOBS = int(os.environ.get("BACKUP_MAX_JOBS", 8))
+# Сколько завершённых фоновых задач бэкапа/восстановления хранить в памяти
+BACKUP_JOB_HISTORY = int(os.environ.get("BACKUP_JOB_HISTORY", 100))
+# Копии по расписанию (cron: минута час день месяц день_недели, пусто - выключено)
+BACKUP_SCHEDULE = os.environ.get("BACKUP_SCHEDULE", "").strip()
+BACKUP_SCHEDULE_JOBS = int(os.environ.get("BACKUP_SCHEDULE_JOBS", 1))
+# Хранилище копий по расписанию с дедупликацией блоков
+BACKUP_STORE_DIR = os.environ.get("BACKUP_STORE_DIR", os.path.join(BACKUP_DIR, "store"))
+BACKUP_CHUNK_SIZE = int(os.environ.get("BACKUP_CHUNK_SIZE", 4 * 1024 * 1024))
+# Политика хранения grandfather-father-son
+BACKUP_KEEP_LAST = int(os.environ.get("BACKUP_KEEP_LAST", 24))
+BACKUP_KEEP_DAILY = int(os.environ.get("BACKUP_KEEP_DAILY", 7))
+BACKUP_KEEP_WEEKLY = int(os.environ.get("BACKUP_KEEP_WEEKLY", 4))
+BACKUP_KEEP_MONTHLY = int(os.environ.get("BACKUP_KEEP_MONTHLY", 12))
+
+# Проверка версии схемы (alembic) при старте: strict | warn | off
+DB_SCHEMA_CHECK = os.environ.get("DB_SCHEMA_CHECK", "strict").lower()
+
 YANDEX_CLIENT_ID = os.environ.get("YANDEX_CLIENT_ID")
 YANDEX_CLIENT_SECRET = os.environ.get("YANDEX_CLIENT_SECRET")
 
@@ -32,4 +71,13 @@ ALGORITHM = os.environ.get("ALGORITHM")
 JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
 JWT_REFRESH_SECRET_KEY = os.environ.get("JWT_REFRESH_SECRET_KEY")
 
+# Кэш отозванных токенов
+REVOCATION_BLOOM_CAPACITY = int(os.environ.get("REVOCATION_BLOOM_CAPACITY", 100000))
+REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get("REVOCATION_BLOOM_ERROR_RATE", 0.001))
+REVOCATION_SYNC_SECONDS = float(os.environ.get("REVOCATION_SYNC_SECONDS", 5))
+
+# Пул потоков для хэширования паролей (bcrypt)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", 32))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/qits/user/login")
\ No newline at end of file
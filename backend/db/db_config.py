@@ -1,12 +1,52 @@
+import time
+import random
+import logging
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASS
+from config import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE, DB_STATEMENT_TIMEOUT_MS, DB_ECHO, DB_QUERY_LOG_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
 
 SQLALCHEMY_DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+# Диалект asyncpg готовит запросы через свой кэш (prepared_statement_cache_size),
+# statement_cache_size - кэш самого asyncpg. 0 отключает оба (pgbouncer в режиме transaction)
+connect_args = {
+    "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+}
+if DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo=DB_ECHO,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=connect_args,
+)
+
+# Выборочное логирование запросов (для production, где echo выключен)
+if not DB_ECHO and DB_QUERY_LOG_SAMPLE_RATE > 0:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if random.random() < DB_QUERY_LOG_SAMPLE_RATE:
+            context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_query_started_at", None)
+        if started_at is not None:
+            elapsed = (time.perf_counter() - started_at) * 1000
+            logger.info(f"(SQL sample) {elapsed:.1f} ms: {statement}")
 
 Base = declarative_base()
 
@@ -21,4 +61,4 @@ async def get_db():
         try:
             yield db
         finally:
-            await db.close()
\ No newline at end of file
+            await db.close()
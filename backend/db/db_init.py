@@ -1,15 +1,77 @@
+import os
 import logging
-from sqlalchemy.ext.asyncio import AsyncSession
-from db.db_config import Base, engine
+
+from typing import Set
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from db.db_config import engine
+from config import DB_SCHEMA_CHECK
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+
+class SchemaVersionError(Exception):
+    """
+    Версия схемы в базе не совпадает с последней миграцией
+    """
+    pass
+
+
+def get_head_revisions() -> Set[str]:
+    """
+    Последние ревизии из файлов миграций (без обращения к базе)
+    """
+    return set(ScriptDirectory(MIGRATIONS_DIR).get_heads())
+
+
+async def get_database_revisions() -> Set[str]:
+    """
+    Ревизии, записанные Alembic в базе. Один запрос к alembic_version
+    """
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            return set()
+        return set(result.scalars().all())
+
+
 async def db_init():
+    """
+    Проверка, что схема базы данных применена миграциями до последней ревизии.
+
+    Схема создаётся и изменяется только через `alembic upgrade head`,
+    при старте таблицы не создаются и каталог не читается.
+    Режим задаётся DB_SCHEMA_CHECK: strict - не запускаться при расхождении,
+    warn - только предупредить, off - не проверять.
+    """
+    if DB_SCHEMA_CHECK == "off":
+        logger.info("(Init database) Schema version check disabled")
+        return
+
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("(Init database) Database initialized successfully")
+        heads = get_head_revisions()
+        current = await get_database_revisions()
     except Exception as e:
         logger.fatal(f"(Init database) Error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+    if current == heads:
+        logger.info(f"(Init database) Database schema is up to date: {', '.join(sorted(current))}")
+        return
+
+    message = (
+        f"Database schema revision {', '.join(sorted(current)) or 'none'} "
+        f"does not match migrations head {', '.join(sorted(heads))}, run 'alembic upgrade head'"
+    )
+    if DB_SCHEMA_CHECK == "strict":
+        logger.fatal(f"(Init database) {message}")
+        raise SchemaVersionError(message)
+
+    logger.warning(f"(Init database) {message}")
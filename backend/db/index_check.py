@@ -0,0 +1,62 @@
+"""
+Проверка, что у каждого внешнего ключа моделей есть индекс.
+
+Без индекса JOIN и фильтр по внешнему ключу читают всю таблицу, а
+удаление родительской строки проверяет ссылки полным сканированием.
+Ключ считается покрытым, если его колонки стоят в начале первичного
+ключа, уникального ограничения или обычного (не частичного) индекса.
+
+Запуск:
+    python -m db.index_check
+"""
+import sys
+
+from typing import List
+
+from sqlalchemy import MetaData, Table, PrimaryKeyConstraint, UniqueConstraint
+
+from db.db_config import Base
+from models.tables.application import Application
+from models.tables.backup import BackupCatalog
+from models.tables.course import Course, CourseStats
+from models.tables.group import Group
+from models.tables.journal import Journal
+from models.tables.task import Task
+from models.tables.user import User, CRL
+
+
+def _column_prefixes(table: Table) -> List[List[str]]:
+    prefixes = []
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+            prefixes.append([column.name for column in constraint.columns])
+
+    for index in table.indexes:
+        # Частичный индекс покрывает только часть строк
+        if index.dialect_options["postgresql"].get("where") is not None:
+            continue
+        prefixes.append([column.name for column in index.columns])
+
+    return prefixes
+
+
+def find_unindexed_foreign_keys(metadata: MetaData) -> List[str]:
+    """
+    Список внешних ключей вида "table(col1, col2)", не покрытых индексом
+    """
+    missing = []
+    for table in metadata.sorted_tables:
+        prefixes = _column_prefixes(table)
+        for foreign_key in table.foreign_key_constraints:
+            columns = {column.name for column in foreign_key.columns}
+            covered = any(set(prefix[:len(columns)]) == columns for prefix in prefixes)
+            if not covered:
+                missing.append(f"{table.name}({', '.join(sorted(columns))})")
+    return missing
+
+
+if __name__ == "__main__":
+    missing = find_unindexed_foreign_keys(Base.metadata)
+    for foreign_key in missing:
+        print(f"Foreign key without index: {foreign_key}")
+    sys.exit(1 if missing else 0)
@@ -0,0 +1,81 @@
+"""
+Курсорная (keyset) пагинация.
+
+Курсор - это base64 от JSON со значениями ключа сортировки последней
+записи страницы. Следующая страница выбирается условием
+(col1, col2) > (:v1, :v2), поэтому стоимость запроса не зависит от глубины
+страницы и не "съезжает" при вставке новых строк.
+"""
+import json
+import uuid
+import base64
+
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _load_value(column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_dump_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *columns) -> List[Any]:
+    """
+    :raises ValueError: Если курсор повреждён или не подходит к ключу сортировки.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_load_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+
+def apply_cursor(query: Select, cursor: Optional[str], *columns, descending: bool = False) -> Select:
+    """
+    Добавляет к запросу сортировку по columns и условие "после курсора"
+    """
+    if descending:
+        query = query.order_by(*[column.desc() for column in columns])
+    else:
+        query = query.order_by(*columns)
+
+    if cursor:
+        values = decode_cursor(cursor, *columns)
+        key = tuple_(*columns) if len(columns) > 1 else columns[0]
+        bound = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.where(key < bound if descending else key > bound)
+
+    return query
+
+
+def next_cursor(items: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """
+    Курсор следующей страницы или None, если страница последняя
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*[getattr(last, attr) for attr in attrs])
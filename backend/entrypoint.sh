@@ -0,0 +1,12 @@
+#!/bin/sh
+set -e
+
+until pg_isready -h "$DB_HOST" -p "${DB_PORT:-5432}" -U "$DB_USER"; do
+  echo "Waiting for PostgreSQL to start..."
+  sleep 1
+done
+
+echo "Applying database migrations..."
+alembic upgrade head
+
+exec python server.py
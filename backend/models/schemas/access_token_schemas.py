@@ -2,4 +2,9 @@ from pydantic import BaseModel
 
 class AccessTokenSchema(BaseModel):
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+
+class PrincipalSchema(BaseModel):
+    sub: str
+    role: str
+    access_token: str
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel
+from enum import Enum
+
+
+class BackupFormat(str, Enum):
+    # Один файл, дамп в один поток
+    CUSTOM = "custom"
+    # Каталог с файлом на таблицу, поддерживает параллельный дамп (-j)
+    DIRECTORY = "directory"
+
+class BackupJobKind(str, Enum):
+    BACKUP = "backup"
+    RESTORE = "restore"
+
+class BackupJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class BackupJobSchema(BaseModel):
+    id: str
+    kind: BackupJobKind
+    status: BackupJobStatus
+    backup_format: Optional[BackupFormat] = None
+    jobs: int
+    backup_file: Optional[str] = None
+    snapshot: Optional[str] = None
+    catalog_id: Optional[int] = None
+    tables_done: int
+    tables_total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BackupSnapshotSchema(BaseModel):
+    name: str
+    created_at: datetime
+    # Размер копии и сколько байт добавлено в хранилище (остальное - общие блоки)
+    size: int
+    stored_size: int
+
+class BackupCatalogSchema(BaseModel):
+    id: int
+    backup_file: str
+    backup_format: BackupFormat
+    size: int
+    sha256: str
+    pg_dump_version: Optional[str] = None
+    # Число строк по таблицам на момент дампа (по статистике PostgreSQL)
+    table_rows: Dict[str, int]
+    duration_seconds: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -9,12 +9,23 @@ class CourseStatus(str, Enum):
     CLOSED = "closed"
     DELETED = "deleted"
 
+class CourseStatsSchema(BaseModel):
+    tasks_closed: int
+    tasks_in_process: int
+    tasks_done: int
+    tasks_deleted: int
+    average_mark: Optional[float]
+
+    class Config:
+        from_attributes = True
+
 class CourseSchema(BaseModel):
     id: int
     name: str
     description: str
     students_count: int
     status: CourseStatus
+    stats: Optional[CourseStatsSchema] = None
 
     class Config:
         from_attributes = True  
@@ -22,7 +33,6 @@ class CourseSchema(BaseModel):
 class CourseCreateSchema(BaseModel):
     name: str
     description: str
-    students_count: int
 
     class Config:
         from_attributes = True 
@@ -30,7 +40,6 @@ class CourseCreateSchema(BaseModel):
 class CourseUpdateSchema(BaseModel):
     name: str
     description: str
-    students_count: int
     status: CourseStatus
 
     class Config:
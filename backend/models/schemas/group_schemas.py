@@ -1,6 +1,7 @@
 from typing import List, Optional
 from pydantic.types import UUID4
 from pydantic import BaseModel
+from enum import Enum
 
 from models.schemas.user_schemas import UserProfileSchema
 
@@ -20,4 +21,24 @@ class GroupSchema(BaseModel):
     course_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class GroupEnrollmentStatus(str, Enum):
+    ADDED = "added"
+    ALREADY_IN_COURSE = "already_in_course"
+    NOT_FOUND = "not_found"
+    NOT_STUDENT = "not_student"
+
+class GroupBulkSchema(BaseModel):
+    course_id: int
+    user_ids: List[UUID4]
+
+    class Config:
+        from_attributes = True
+
+class GroupBulkResultSchema(BaseModel):
+    user_id: UUID4
+    status: GroupEnrollmentStatus
+
+    class Config:
+        from_attributes = True
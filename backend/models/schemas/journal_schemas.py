@@ -0,0 +1,53 @@
+from typing import List, Optional
+from pydantic.types import UUID4
+from pydantic import BaseModel, Field
+
+
+class JournalStudentAverageSchema(BaseModel):
+    user_id: UUID4
+    name: str
+    average_mark: Optional[float]
+    tasks_count: int
+    rank: int
+
+    class Config:
+        from_attributes = True
+
+class JournalTaskStatsSchema(BaseModel):
+    task_id: int
+    name: str
+    average_mark: Optional[float]
+    min_mark: Optional[int]
+    max_mark: Optional[int]
+    graded_count: int
+    students_count: int
+
+    class Config:
+        from_attributes = True
+
+class JournalMarkSchema(BaseModel):
+    user_id: UUID4
+    task_id: int
+    # 0 хранится в журнале как "не проверено", поэтому оценка от 1
+    mark: int = Field(ge=1)
+    comment: Optional[str] = None
+    # Версия записи, которую видел преподаватель; None - без проверки
+    version: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class JournalBulkMarkSchema(BaseModel):
+    marks: List[JournalMarkSchema]
+
+    class Config:
+        from_attributes = True
+
+class JournalMarkResultSchema(BaseModel):
+    user_id: UUID4
+    task_id: int
+    mark: int
+    version: int
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from enum import Enum
@@ -33,4 +34,29 @@ class TaskCreateSchema(BaseModel):
     course_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskBulkCreateSchema(BaseModel):
+    tasks: List[TaskCreateSchema]
+
+    class Config:
+        from_attributes = True
+
+
+class TaskBulkStatusSchema(BaseModel):
+    status: TaskStatus
+    # Без task_ids меняются все задания курса, подходящие под фильтр
+    task_ids: Optional[List[int]] = None
+    from_statuses: Optional[List[TaskStatus]] = None
+
+    class Config:
+        from_attributes = True
+
+class TaskBulkStatusResultSchema(BaseModel):
+    course_id: int
+    status: TaskStatus
+    updated_ids: List[int]
+    skipped_ids: List[int]
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Index, func
 from db.db_config import Base
 
 class Application(Base):
@@ -8,9 +8,13 @@ class Application(Base):
     user_name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)
     email = Column(String, nullable=False)
-    course_id = Column(Integer, nullable=False)
-    status = Column(Enum('readed', 'new', name='application_status'), default='new', nullable=False)
+    course_id = Column(Integer, nullable=False, index=True)
+    status = Column(Enum('readed', 'new', name='application_status'), default='new', nullable=False, index=True)
     application_date = Column(DateTime, default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_application_application_date_id", "application_date", "id"),
+    )
+
     def __repr__(self):
         return f"<Application(id={self.id}, user_name='{self.user_name}', phone_number='{self.phone_number}', email='{self.email}' course_id={self.course_id}, status='{self.status}', application_date='{self.application_date}')>"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, func
+from sqlalchemy.dialects.postgresql import JSONB
+from db.db_config import Base
+
+# Каталог резервных копий. Таблица не попадает в дамп (pg_dump --exclude-table),
+# поэтому восстановление копии не затирает сам каталог
+class BackupCatalog(Base):
+    __tablename__ = 'backup_catalog'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    backup_file = Column(String, nullable=False, unique=True)
+    backup_format = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    pg_dump_version = Column(String)
+    # {"schema.table": число строк} по статистике на момент дампа
+    table_rows = Column(JSONB, nullable=False, server_default="{}")
+    duration_seconds = Column(Float, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<BackupCatalog(id={self.id}, backup_file='{self.backup_file}', size={self.size}, sha256='{self.sha256}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from db.db_config import Base
 from models.tables.group import Group
@@ -9,12 +9,39 @@ class Course(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
     description = Column(String)
-    students_count = Column(Integer, default=0)
-    status = Column(Enum('active', 'closed', 'deleted', name='course_status'), default='active', nullable=False)
+    # Поддерживается триггерами на group, вручную не изменяется
+    students_count = Column(Integer, nullable=False, default=0, server_default="0")
+    status = Column(Enum('active', 'closed', 'deleted', name='course_status'), default='active', nullable=False, index=True)
 
     users = relationship("User", secondary=Group.__table__, back_populates="courses", lazy='select')
     
     tasks = relationship("Task", back_populates="course", cascade="all, delete-orphan", lazy='select')
 
+    stats = relationship("CourseStats", uselist=False, viewonly=True, lazy='select')
+
+    # Витрина сайта показывает только активные курсы
+    __table_args__ = (
+        Index("ix_course_active_id", "id", postgresql_where=text("status = 'active'")),
+    )
+
+    def __repr__(self):
+        return f"<Course(id={self.id}, name='{self.name}', description='{self.description}', students_count={self.students_count}, status='{self.status}')>"
+
+# Сводная статистика курса, поддерживается триггерами на task и journal
+class CourseStats(Base):
+    __tablename__ = 'course_stats'
+
+    course_id = Column(Integer, ForeignKey('course.id', ondelete='CASCADE'), primary_key=True)
+    tasks_closed = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_in_process = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_done = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_deleted = Column(Integer, nullable=False, default=0, server_default="0")
+    marks_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    marks_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    @property
+    def average_mark(self):
+        return self.marks_sum / self.marks_count if self.marks_count else None
+
     def __repr__(self):
-        return f"<Course(id={self.id}, name='{self.name}', description='{self.description}', students_count={self.students_count}, status='{self.status}')>"
\ No newline at end of file
+        return f"<CourseStats(course_id={self.course_id}, tasks_done={self.tasks_done}, marks_count={self.marks_count})>"
@@ -6,7 +6,7 @@ class Group(Base):
     __tablename__ = 'group'
 
     user_id = Column(UUID(as_uuid=True), ForeignKey('user.id'), primary_key=True)
-    course_id = Column(Integer, ForeignKey('course.id'), primary_key=True)
+    course_id = Column(Integer, ForeignKey('course.id'), primary_key=True, index=True)
 
     def __repr__(self):
         return f"<Group(user_id={self.user_id}, course_id={self.course_id})>"
\ No newline at end of file
@@ -6,10 +6,12 @@ class Journal(Base):
     __tablename__ = 'journal'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey('user.id'), primary_key=True)
-    task_id = Column(Integer, ForeignKey('task.id'), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('user.id'), primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey('task.id'), primary_key=True, index=True)
     mark = Column(Integer, nullable=False)
     comment = Column(String)
+    # Версия записи для оптимистичной блокировки при выставлении оценок
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     def __repr__(self):
-        return f"<Group(id={self.id}, user_id={self.user_id}, task_id={self.task_id}, mark={self.mark}, comment='{self.comment}')>"
\ No newline at end of file
+        return f"<Group(id={self.id}, user_id={self.user_id}, task_id={self.task_id}, mark={self.mark}, comment='{self.comment}', version={self.version})>"
\ No newline at end of file
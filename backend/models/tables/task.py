@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from db.db_config import Base
 from models.tables.journal import Journal
@@ -15,5 +15,10 @@ class Task(Base):
     users = relationship("User", secondary=Journal.__table__, back_populates="tasks", lazy='select')
     course = relationship("Course", back_populates="tasks")
 
+    # Список заданий курса с фильтром по статусам и курсором по id
+    __table_args__ = (
+        Index("ix_task_course_id_status_id", "course_id", "status", "id"),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, name='{self.name}', description='{self.description}', status='{self.status}', course_id={self.course_id})>"
\ No newline at end of file
@@ -2,7 +2,7 @@ import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import Column, Integer, String, DateTime, func, Enum
-from db.db_init import Base
+from db.db_config import Base
 from models.tables.journal import Journal
 from models.tables.group import Group
 
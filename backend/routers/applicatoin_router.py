@@ -1,16 +1,17 @@
 import logging
 
 import traceback
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from db.db_config import get_db
-from config import oauth2_scheme
+from db.pagination import next_cursor
 
 from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
 from models.schemas.message_schemas import MessageSchema
-from services.auth_service import AuthService
+from services.auth_service import require_role
 from services.applicatoin_service import ApplicationService
 from models.schemas.application_schemas import ApplicationCreateSchema, ApplicationSchema
 
@@ -95,31 +96,29 @@ async def create_application(
     }
 )
 async def get_applications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
-    access_token: str = Depends(oauth2_scheme),
+    cursor: Optional[str] = None,
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
     application_service: ApplicationService = Depends(ApplicationService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> List[ApplicationSchema]:
     """
     Просмотр всех заявок (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get applications) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
+        applications = await application_service.get_applications(db, skip=skip, limit=limit, cursor=cursor)
 
-        if role != "admin":
-            logger.warning(f"(Get applications) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
+        page_cursor = next_cursor(applications, limit, "application_date", "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
-        applications = await application_service.get_applications(db, skip=skip, limit=limit)
         logger.info(f"(Get applications) Successfully retrived {len(applications)} applications")
         return applications
+    except ValueError as validation_error:
+        logger.warning(f"(Get applications) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get applications) Error: {e}", exc_info=True)
         logger.error(traceback.format_exc())
@@ -155,25 +154,13 @@ async def get_applications(
 async def get_application(
     application_id: int, 
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     application_service: ApplicationService = Depends(ApplicationService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> ApplicationSchema:
     """
     Просмотр конкретной заявки (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get application by id) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Get application by id) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-
         application = await application_service.get_application_by_id(db, application_id)
 
         if not application:
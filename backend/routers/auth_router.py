@@ -13,7 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from authlib.integrations.starlette_client import OAuthError
 
-from services.auth_service import AuthService
+from services.auth_service import AuthService, PasswordHashBusyError
 from services.user_service import UserService
 
 from models.schemas.error_schemas import ErrorSchema
@@ -64,6 +64,10 @@ async def auth_yandex(request: Request):
             "model": ErrorSchema,
             "description": "Invalid OAuth response or missing email",
         },
+        503: {
+            "model": ErrorSchema,
+            "description": "Server is busy"
+        },
         500: {
             "model": ErrorSchema,
             "description": "Internal server error",
@@ -109,6 +113,9 @@ async def auth_yandex_callback(
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
+    except PasswordHashBusyError as e:
+        logger.warning(f"(Yandex Auth) Password hashing is busy: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, try again later", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"(Yandex Auth) Error: {e}")
         logger.error(traceback.format_exc())
@@ -152,6 +159,10 @@ async def auth_vk(request: Request):
             "model": ErrorSchema,
             "description": "Invalid OAuth response or missing email",
         },
+        503: {
+            "model": ErrorSchema,
+            "description": "Server is busy"
+        },
         500: {
             "model": ErrorSchema,
             "description": "Internal server error",
@@ -201,6 +212,9 @@ async def auth_vk_callback(
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
+    except PasswordHashBusyError as e:
+        logger.warning(f"(VK Auth) Password hashing is busy: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, try again later", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"(VK Auth) Error: {e}")
         logger.error(traceback.format_exc())
@@ -1,31 +1,92 @@
 import os
+import asyncio
 import logging
 import traceback
 
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
-from db.db_config import get_db
-from config import oauth2_scheme
+from db.db_config import get_db, AsyncSessionLocal
+from db.pagination import next_cursor
+from config import BACKUP_DIR, BACKUP_MAX_JOBS
 
-from services.auth_service import AuthService
-from services.backup_service import BackupService
+from services.auth_service import require_role
+from services.backup_service import BackupService, BackupStream, BackupChecksumError
+from services.backup_catalog_service import BackupCatalogService
+from services.backup_jobs import backup_jobs, BackupJob, BackupJobConflictError
+from services.backup_scheduler import backup_scheduler
+from services.backup_store import backup_store
 from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
 from models.schemas.message_schemas import MessageSchema 
+from models.schemas.backup_schemas import BackupFormat, BackupJobSchema, BackupSnapshotSchema, BackupCatalogSchema
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 backup_router = APIRouter(prefix="/backup", tags=["Backup"])
 
+
+async def backup_download_response(backup_service: BackupService, backup_file: str):
+    """
+    Файл custom отдаётся как есть, каталог directory - tar-архивом на лету
+    """
+    if os.path.isdir(backup_file):
+        stream = await backup_service.open_tar_stream(backup_file)
+        filename = f"{os.path.basename(backup_file)}.tar"
+        return StreamingResponse(
+            stream,
+            media_type="application/x-tar",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            background=BackgroundTask(stream.close)
+        )
+
+    return FileResponse(backup_file, filename=os.path.basename(backup_file))
+
+
+async def wait_job(job: BackupJob) -> None:
+    """
+    Ожидание задачи для синхронных эндпоинтов. Отключение клиента
+    не прерывает задачу: её можно отменить через /jobs/{job_id}/cancel
+    """
+    await job.wait()
+    if job.status == "cancelled":
+        raise HTTPException(status_code=409, detail=f"Backup job {job.id} was cancelled")
+    job.raise_for_error()
+
+
+async def close_stream(stream: BackupStream, table_rows: Optional[Dict[str, int]] = None) -> None:
+    """
+    Завершение потока после ответа. Сохранённая на диск копия записывается
+    в каталог с размером и SHA-256, посчитанными по ходу передачи
+    """
+    await stream.close()
+    if stream.completed and stream.backup_file:
+        async with AsyncSessionLocal() as db:
+            await BackupCatalogService().add_entry(
+                db, stream.backup_file, BackupFormat.CUSTOM.value, table_rows or {},
+                stream.duration_seconds, stream.size, stream.sha256
+            )
+
+
 @backup_router.post(
         "/create",
         response_class=FileResponse,
         responses={
             200: {
                 "model": "",
-                "description": "Backup created successfully"
+                "description": "Backup created successfully (tar archive for directory format)"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid backup parameters"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Backup job was cancelled"
             },
             401:{
                 "model": ErrorSchema,
@@ -42,37 +103,83 @@ backup_router = APIRouter(prefix="/backup", tags=["Backup"])
         }
         )
 async def create_backup(
-    backup_dir: str = "backups",
+    backup_dir: str = BACKUP_DIR,
+    backup_format: BackupFormat = BackupFormat.CUSTOM,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     backup_service: BackupService = Depends(BackupService)
     ):
     """
-    Создание бэкапа бд (только для администратора)
+    Создание бэкапа бд с ожиданием результата (через очередь задач),
+    jobs > 1 - параллельный дамп в формате directory (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Create course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Create course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
-        backup_file = await backup_service.create_backup(backup_dir)
+        job = backup_jobs.submit_backup(backup_format.value, jobs, backup_dir)
+        await wait_job(job)
         logger.info(f"(Create backup) Backup successfully created")
 
-        return FileResponse(backup_file, filename=os.path.basename(backup_file))
+        return await backup_download_response(backup_service, job.backup_file)
     
+    except HTTPException:
+        raise
+    except ValueError as validation_error:
+        logger.warning(f"(Create backup) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Create backup) Error: {e}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail="Internal server error")
     
+@backup_router.post(
+        "/stream",
+        response_class=StreamingResponse,
+        responses={
+            200: {
+                "content": {"application/octet-stream": {}},
+                "description": "Backup stream started"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def stream_backup(
+    save: bool = False,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    backup_service: BackupService = Depends(BackupService)
+    ):
+    """
+    Потоковое скачивание бэкапа бд по мере создания, save - сохранить копию на диск (только для администратора)
+    """
+    try:
+        filename = backup_service.backup_filename()
+        table_rows = await backup_service.get_table_rows(db) if save else None
+        stream = await backup_service.open_backup_stream(BACKUP_DIR if save else None, filename)
+        logger.info(f"(Stream backup) Backup stream started: {filename}")
+
+        return StreamingResponse(
+            stream,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            background=BackgroundTask(close_stream, stream, table_rows)
+        )
+
+    except Exception as e:
+        logger.error(f"(Stream backup) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 
 @backup_router.post(
         "/restore",
@@ -82,6 +189,14 @@ async def create_backup(
                 "model": MessageSchema,
                 "description": "Backup restored successfully"
             },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid restore parameters"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Another restore is in progress, the job was cancelled or the backup checksum does not match"
+            },
             401:{
                 "model": ErrorSchema,
                 "description": "Unauthorized"
@@ -98,34 +213,670 @@ async def create_backup(
         )
 async def restore_backup(
     backup_file: str,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     backup_service: BackupService = Depends(BackupService) 
     ):
     """
-    Восстановление бэкапа бд (только для администартора)
+    Восстановление бэкапа бд из каталога с проверкой контрольной суммы
+    и ожиданием результата (через очередь задач), jobs - число параллельных потоков pg_restore (только для администартора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Create course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Create course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
-        await backup_service.restore_backup(backup_file)
+        job = backup_jobs.submit_restore(backup_file, jobs)
+        await wait_job(job)
         logger.info(f"(Restore backup) Backup successfully restored")
 
         return MessageSchema(
             messageDigest=str(backup_file),
             description=f"(Restore backup) Backup restored successuly"
         )
+    except HTTPException:
+        raise
+    except (BackupJobConflictError, BackupChecksumError) as e:
+        logger.warning(f"(Restore backup) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as validation_error:
+        logger.warning(f"(Restore backup) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Create backup) Error: {e}")
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@backup_router.post(
+        "/jobs",
+        response_model=BackupJobSchema,
+        status_code=202,
+        responses={
+            202: {
+                "model": BackupJobSchema,
+                "description": "Backup job queued"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid backup parameters"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def submit_backup_job(
+    backup_dir: str = BACKUP_DIR,
+    backup_format: BackupFormat = BackupFormat.CUSTOM,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Постановка создания бэкапа бд в очередь, возвращает задачу (только для администратора)
+    """
+    try:
+        job = backup_jobs.submit_backup(backup_format.value, jobs, backup_dir)
+        logger.info(f"(Submit backup job) Job {job.id} queued")
+        return BackupJobSchema.model_validate(job)
+
+    except ValueError as validation_error:
+        logger.warning(f"(Submit backup job) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Submit backup job) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/jobs/restore",
+        response_model=BackupJobSchema,
+        status_code=202,
+        responses={
+            202: {
+                "model": BackupJobSchema,
+                "description": "Restore job queued"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid restore parameters"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Another restore is in progress"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def submit_restore_job(
+    backup_file: str,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Постановка восстановления бэкапа бд в очередь, одновременно не больше одного.
+    Копия должна быть в каталоге, контрольная сумма проверяется перед восстановлением (только для администратора)
+    """
+    try:
+        job = backup_jobs.submit_restore(backup_file, jobs)
+        logger.info(f"(Submit restore job) Job {job.id} queued")
+        return BackupJobSchema.model_validate(job)
+
+    except BackupJobConflictError as e:
+        logger.warning(f"(Submit restore job) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as validation_error:
+        logger.warning(f"(Submit restore job) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Submit restore job) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.get(
+        "/jobs",
+        response_model=List[BackupJobSchema],
+        responses={
+            200: {
+                "model": List[BackupJobSchema],
+                "description": "Backup jobs retrieved successfully"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def get_backup_jobs(
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> List[BackupJobSchema]:
+    """
+    Список задач бэкапа и восстановления, новые первыми (только для администратора)
+    """
+    try:
+        return [BackupJobSchema.model_validate(job) for job in backup_jobs.get_jobs()]
+
+    except Exception as e:
+        logger.error(f"(Get backup jobs) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.get(
+        "/jobs/{job_id}",
+        response_model=BackupJobSchema,
+        responses={
+            200: {
+                "model": BackupJobSchema,
+                "description": "Backup job retrieved successfully"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            404: {
+                "model": ErrorSchema,
+                "description": "Backup job not found"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def get_backup_job(
+    job_id: str,
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Состояние и прогресс задачи (таблиц обработано из общего числа) (только для администратора)
+    """
+    try:
+        job = backup_jobs.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Backup job not found")
+
+        return BackupJobSchema.model_validate(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"(Get backup job) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/jobs/{job_id}/cancel",
+        response_model=BackupJobSchema,
+        responses={
+            200: {
+                "model": BackupJobSchema,
+                "description": "Backup job cancelled"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            404: {
+                "model": ErrorSchema,
+                "description": "Backup job not found"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def cancel_backup_job(
+    job_id: str,
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Отмена задачи: снятие с очереди или завершение процесса (только для администратора)
+    """
+    try:
+        job = await backup_jobs.cancel(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Backup job not found")
+
+        logger.info(f"(Cancel backup job) Job {job.id} is {job.status}")
+        return BackupJobSchema.model_validate(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"(Cancel backup job) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.get(
+        "/jobs/{job_id}/download",
+        response_class=FileResponse,
+        responses={
+            200: {
+                "model": "",
+                "description": "Backup file (tar archive for directory format)"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            404: {
+                "model": ErrorSchema,
+                "description": "Backup job or file not found"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Backup job has not succeeded or its result is a snapshot"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def download_backup_job(
+    job_id: str,
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    backup_service: BackupService = Depends(BackupService)
+    ):
+    """
+    Скачивание результата завершённой задачи бэкапа (только для администратора)
+    """
+    try:
+        job = backup_jobs.get_job(job_id)
+        if not job or job.kind != "backup":
+            raise HTTPException(status_code=404, detail="Backup job not found")
+        if job.status != "succeeded":
+            raise HTTPException(status_code=409, detail=f"Backup job is {job.status}")
+        if job.snapshot is not None:
+            # Копия перенесена в хранилище с дедупликацией, файла на диске нет
+            raise HTTPException(
+                status_code=409,
+                detail=f"Backup job result is stored as snapshot {job.snapshot}, use /backup/snapshots/{job.snapshot}/restore"
+            )
+        if not job.backup_file or not os.path.exists(job.backup_file):
+            raise HTTPException(status_code=404, detail="Backup file not found")
+
+        return await backup_download_response(backup_service, job.backup_file)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"(Download backup job) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.get(
+        "/snapshots",
+        response_model=List[BackupSnapshotSchema],
+        responses={
+            200: {
+                "model": List[BackupSnapshotSchema],
+                "description": "Snapshots retrieved successfully"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def get_snapshots(
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> List[BackupSnapshotSchema]:
+    """
+    Список копий в хранилище по расписанию, новые первыми (только для администратора)
+    """
+    try:
+        snapshots = await asyncio.to_thread(backup_store.get_snapshots)
+        return [BackupSnapshotSchema.model_validate(snapshot) for snapshot in snapshots]
+
+    except Exception as e:
+        logger.error(f"(Get snapshots) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/snapshots",
+        response_model=BackupJobSchema,
+        status_code=202,
+        responses={
+            202: {
+                "model": BackupJobSchema,
+                "description": "Snapshot job queued"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Previous snapshot is not finished yet"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def create_snapshot(
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Внеочередная копия в хранилище, как по расписанию (только для администратора)
+    """
+    try:
+        job = backup_scheduler.run_once()
+        if not job:
+            raise HTTPException(status_code=409, detail="Previous snapshot is not finished yet")
+
+        logger.info(f"(Create snapshot) Job {job.id} queued")
+        return BackupJobSchema.model_validate(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"(Create snapshot) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/snapshots/{name}/restore",
+        response_model=BackupJobSchema,
+        status_code=202,
+        responses={
+            202: {
+                "model": BackupJobSchema,
+                "description": "Restore job queued"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Snapshot not found or invalid restore parameters"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Another restore is in progress"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def restore_snapshot(
+    name: str,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
+    principal: PrincipalSchema = Depends(require_role("admin"))
+    ) -> BackupJobSchema:
+    """
+    Постановка восстановления копии из хранилища в очередь (только для администратора)
+    """
+    try:
+        job = backup_jobs.submit_restore(jobs=jobs, snapshot=name)
+        logger.info(f"(Restore snapshot) Job {job.id} queued")
+        return BackupJobSchema.model_validate(job)
+
+    except BackupJobConflictError as e:
+        logger.warning(f"(Restore snapshot) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as validation_error:
+        logger.warning(f"(Restore snapshot) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Restore snapshot) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.get(
+        "/catalog",
+        response_model=List[BackupCatalogSchema],
+        responses={
+            200: {
+                "model": List[BackupCatalogSchema],
+                "description": "Backup catalog retrieved successfully"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid cursor"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def get_backup_catalog(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    catalog_service: BackupCatalogService = Depends(BackupCatalogService)
+    ) -> List[BackupCatalogSchema]:
+    """
+    Каталог резервных копий: размер, SHA-256, версия pg_dump, строки по таблицам, длительность (только для администратора)
+    """
+    try:
+        entries = await catalog_service.get_entries(db, skip=skip, limit=limit, cursor=cursor)
+
+        page_cursor = next_cursor(entries, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+
+        logger.info(f"(Get backup catalog) Retrieved {len(entries)} entries")
+        return entries
+
+    except ValueError as validation_error:
+        logger.warning(f"(Get backup catalog) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Get backup catalog) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/catalog/{entry_id}/verify",
+        response_model=BackupCatalogSchema,
+        responses={
+            200: {
+                "model": BackupCatalogSchema,
+                "description": "Backup checksum matches the catalog"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Backup file not found"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            404: {
+                "model": ErrorSchema,
+                "description": "Catalog entry not found"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Backup checksum does not match the catalog"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def verify_backup(
+    entry_id: int,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    catalog_service: BackupCatalogService = Depends(BackupCatalogService)
+    ) -> BackupCatalogSchema:
+    """
+    Проверка целостности копии по SHA-256 из каталога, файл читается потоково (только для администратора)
+    """
+    try:
+        entry = await catalog_service.get_entry_by_id(db, entry_id)
+        if not entry:
+            raise HTTPException(status_code=404, detail="Catalog entry not found")
+
+        await catalog_service.verify_entry(entry)
+        logger.info(f"(Verify backup) Backup {entry.backup_file} verified")
+        return entry
+
+    except HTTPException:
+        raise
+    except BackupChecksumError as e:
+        logger.warning(f"(Verify backup) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as validation_error:
+        logger.warning(f"(Verify backup) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Verify backup) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@backup_router.post(
+        "/catalog/{entry_id}/restore",
+        response_model=BackupJobSchema,
+        status_code=202,
+        responses={
+            202: {
+                "model": BackupJobSchema,
+                "description": "Restore job queued"
+            },
+            400: {
+                "model": ErrorSchema,
+                "description": "Invalid restore parameters"
+            },
+            401:{
+                "model": ErrorSchema,
+                "description": "Unauthorized"
+            },
+            403:{
+                "model": ErrorSchema,
+                "description": "Bad token"
+            },
+            404: {
+                "model": ErrorSchema,
+                "description": "Catalog entry not found"
+            },
+            409: {
+                "model": ErrorSchema,
+                "description": "Another restore is in progress"
+            },
+            500: {
+                "model": ErrorSchema,
+                "description": "Internal server error"
+            } 
+        }
+        )
+async def restore_catalog_entry(
+    entry_id: int,
+    jobs: int = Query(1, ge=1, le=BACKUP_MAX_JOBS),
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    catalog_service: BackupCatalogService = Depends(BackupCatalogService)
+    ) -> BackupJobSchema:
+    """
+    Постановка восстановления копии из каталога в очередь, контрольная сумма проверяется перед восстановлением (только для администратора)
+    """
+    try:
+        entry = await catalog_service.get_entry_by_id(db, entry_id)
+        if not entry:
+            raise HTTPException(status_code=404, detail="Catalog entry not found")
+
+        job = backup_jobs.submit_restore(entry.backup_file, jobs)
+        logger.info(f"(Restore catalog entry) Job {job.id} queued")
+        return BackupJobSchema.model_validate(job)
+
+    except HTTPException:
+        raise
+    except BackupJobConflictError as e:
+        logger.warning(f"(Restore catalog entry) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as validation_error:
+        logger.warning(f"(Restore catalog entry) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Restore catalog entry) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
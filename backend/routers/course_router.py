@@ -1,17 +1,20 @@
 import logging
 import traceback
 
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from db.db_config import get_db
-from config import oauth2_scheme
+from db.pagination import next_cursor
 
-from services.auth_service import AuthService
+from services.auth_service import get_current_principal, require_role
 from services.course_service import CourseService
+from services.response_cache import active_courses_cache
 from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
 from models.schemas.message_schemas import MessageSchema 
+from models.schemas.task_schemas import TaskStatus
 from models.schemas.course_schemas import CourseWithTasksSchema, CourseCreateSchema, CourseSchema, CourseUpdateSchema
 
 logging.basicConfig(level=logging.INFO)
@@ -50,30 +53,17 @@ course_router = APIRouter(prefix="/course")
 async def create_course(
     course_data: CourseCreateSchema,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     course_service: CourseService = Depends(CourseService)
     ) -> MessageSchema:
     """
     Создание курса (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Create course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Create course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         course = await course_service.create_course(
             db = db, 
             name=course_data.name,
             description=course_data.description,
-            students_count=course_data.students_count,
         )
 
         logger.info(f"(Create course) Course successfully created: {course.id}")
@@ -116,10 +106,11 @@ async def create_course(
     }
 )
 async def get_courses(
+    response: Response,
     skip: int = 0, 
     limit: int = 25,
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    cursor: Optional[str] = None,
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
     course_service: CourseService = Depends(CourseService)
     ) -> List[CourseSchema]:
@@ -127,21 +118,18 @@ async def get_courses(
     Просмотр всех курсов (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get courses) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
+        courses = await course_service.get_courses(db, skip=skip, limit=limit, cursor=cursor)
 
-        if role != "admin":
-            logger.warning(f"(Get courses) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        courses = await course_service.get_courses(db, skip=skip, limit=limit)
+        page_cursor = next_cursor(courses, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
         logger.info(f"(Get courses) Successfully retrieved {len(courses)} courses")
         return courses
     
+    except ValueError as validation_error:
+        logger.warning(f"(Get courses) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get courses) Error: {e}", exc_info=True)
         logger.error(traceback.format_exc())
@@ -171,26 +159,38 @@ async def get_courses(
     }
 )
 async def get_courses_with_tasks(
+    response: Response,
     skip: int = 0,
     limit: int = 5,
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    cursor: Optional[str] = None,
+    task_status: Optional[List[TaskStatus]] = Query(None),
+    principal: PrincipalSchema = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     course_service: CourseService = Depends(CourseService)
     ) -> List[CourseWithTasksSchema]:
     """
-    Просмотр всех курсов с их задачами
+    Просмотр всех курсов с их задачами (по умолчанию без удалённых задач)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get courses with tasks) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        courses = await course_service.get_courses_with_tasks(db, skip=skip, limit=limit)
+        courses = await course_service.get_courses_with_tasks(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            task_statuses=[status.value for status in task_status] if task_status else None
+        )
+
+        page_cursor = next_cursor(courses, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
         logger.info(f"(Get courses with tasks) Successfully retrieved {len(courses)} courses")
         return courses
 
+    except ValueError as validation_error:
+        logger.warning(f"(Get courses with tasks) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+
     except Exception as e:
         logger.error(f"(Get courses with tasks) Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -203,6 +203,10 @@ async def get_courses_with_tasks(
         200: {
             "model": List[CourseSchema]
         },
+        400: {
+            "model": ErrorSchema,
+            "description": "Invalid cursor"
+        },
         401:{
             "model": ErrorSchema,
             "description": "Unauthorized"
@@ -218,20 +222,40 @@ async def get_courses_with_tasks(
     }
 )
 async def get_active_courses(
+    response: Response,
     skip: int = 0, 
     limit: int = 10,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     course_service: CourseService = Depends(CourseService)
     ) -> List[CourseSchema]:
     """
-    Просмотр всех неудалённых курсов
+    Просмотр всех активных курсов
     """
     try:
-        courses = await course_service.get_active_courses(db, skip=skip, limit=limit)
+        cache_key = (skip, limit, cursor)
+        page = active_courses_cache.get(cache_key)
+
+        if page is None:
+            courses = await course_service.get_active_courses(db, skip=skip, limit=limit, cursor=cursor)
+            page = (
+                [CourseSchema.model_validate(course) for course in courses],
+                next_cursor(courses, limit, "id")
+            )
+            active_courses_cache.set(cache_key, page)
+
+        courses, page_cursor = page
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        if active_courses_cache.enabled:
+            response.headers["Cache-Control"] = f"public, max-age={int(active_courses_cache.ttl)}"
 
         logger.info(f"(Get active courses) Successfully retrieved {len(courses)} courses")
         return courses
     
+    except ValueError as validation_error:
+        logger.warning(f"(Get active courses) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get active courses) Error: {e}", exc_info=True)
         logger.error(traceback.format_exc())
@@ -314,8 +338,7 @@ async def get_course(
 async def update_course(
     course_id: int,
     course_data: CourseUpdateSchema,
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
     course_service: CourseService = Depends(CourseService)
     ) -> MessageSchema:
@@ -323,23 +346,11 @@ async def update_course(
     Обвновление данных курса (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Update course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Update course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-
         updated_course = await course_service.update_course(
             db = db,
             course_id=course_id,
             course_name=course_data.name,
             course_description=course_data.description,
-            course_students_count=course_data.students_count,
             course_status=course_data.status
         )
 
@@ -402,25 +413,13 @@ async def update_course(
 async def soft_delete_course(
     course_id: int,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     course_service: CourseService = Depends(CourseService)
     ) -> MessageSchema:
     """
     Обновление статуса курса на удалённый (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Delete status course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Delete status course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         deleted_course = await course_service.delete_status_course(db, course_id)
 
         if not deleted_course:
@@ -471,25 +470,13 @@ async def soft_delete_course(
 async def hard_delete_course(
     course_id: int,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     course_service: CourseService = Depends(CourseService)
     ) -> MessageSchema:
     """
     Удаление курса из базы данных (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Delete course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Delete course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         deleted_course = await course_service.delete_course(db, course_id)
 
         if not deleted_course:
@@ -1,18 +1,19 @@
 import logging
 
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from db.db_config import get_db
-from config import oauth2_scheme
+from db.pagination import next_cursor
 
-from services.auth_service import AuthService
+from services.auth_service import require_role
 from services.group_service import GroupService
 from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
 from models.schemas.message_schemas import MessageSchema
 
-from models.schemas.group_schemas import GroupCourseWithStudentsSchema, GroupSchema
+from models.schemas.group_schemas import GroupCourseWithStudentsSchema, GroupSchema, GroupBulkSchema, GroupBulkResultSchema
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,25 +51,13 @@ group_router = APIRouter(prefix="/group")
 async def add_student_on_course(
     group_data: GroupSchema,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     group_service: GroupService = Depends(GroupService)
     ) -> MessageSchema:
     """
     Добавление студента в группу (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Add student to course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Add student to course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         student = await group_service.add_student_to_course(db, group_data.course_id, group_data.user_id)
         if not student:
             logger.warning(f"(Add student to course) Student {group_data.user_id} not added to course {group_data.course_id}")
@@ -83,6 +72,61 @@ async def add_student_on_course(
         logger.error(f"(Add student to course) Error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@group_router.post(
+    "/students/add",
+    tags=["Group"],
+    response_model=List[GroupBulkResultSchema],
+    responses={
+        200: {
+            "model": List[GroupBulkResultSchema],
+            "description": "Per-user enrollment results"
+        },
+        400: {
+            "model": ErrorSchema,
+            "description": "Invalid input data"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        404: {
+            "model": ErrorSchema,
+            "description": "Course not found"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def add_students_on_course(
+    group_data: GroupBulkSchema,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    group_service: GroupService = Depends(GroupService)
+    ) -> List[GroupBulkResultSchema]:
+    """
+    Массовое добавление студентов в группу (только для администратора)
+    """
+    try:
+        results = await group_service.add_students_to_course(db, group_data.course_id, group_data.user_ids)
+        if results is None:
+            logger.warning(f"(Add students to course) Course {group_data.course_id} not found")
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        logger.info(f"(Add students to course) Processed {len(results)} students for course {group_data.course_id}")
+        return results
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"(Add students to course) Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @group_router.post(
     "/student/remove",
     tags=["Group"],
@@ -113,25 +157,13 @@ async def add_student_on_course(
 async def remove_student_from_course(
     group_data: GroupSchema,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     group_service: GroupService = Depends(GroupService)
     ) -> MessageSchema:
     """
     Удаление студента из группы (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Remove student from course) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Remove student from course) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         await group_service.remove_student_from_course(db, group_data.course_id, group_data.user_id)
         logger.info(f"(Remove student from course) Student {group_data.user_id} added to course {group_data.course_id}")
         return MessageSchema(description="Student added successfully")
@@ -166,34 +198,32 @@ async def remove_student_from_course(
     }
 )
 async def get_all_groups(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    access_token: str = Depends(oauth2_scheme),
+    cursor: Optional[str] = None,
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
-    auth_service: AuthService = Depends(AuthService),
     group_service: GroupService = Depends(GroupService)
 ) -> List[GroupCourseWithStudentsSchema]:
     """
     Получение списка всех студентов всех курсов (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get all groups) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
+        groups = await group_service.get_all_groups(db, skip, limit, cursor)
 
-        if role != "admin":
-            logger.warning(f"(Get all groups) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
+        page_cursor = next_cursor(groups, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
-        groups = await group_service.get_all_groups(db, skip, limit)
         logger.info(f"(Get all groups) Retrieved {len(groups)} groups")
         return groups
 
     except HTTPException:
         raise
+    except ValueError as validation_error:
+        logger.warning(f"(Get all groups) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get all groups) Error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -224,26 +254,14 @@ async def get_all_groups(
 )
 async def get_students_list_by_course_id(
     course_id: int,
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
-    auth_service: AuthService = Depends(AuthService),
     group_service: GroupService = Depends(GroupService)
 ) -> GroupCourseWithStudentsSchema:
     """
     Получене списка студентов по конкретном курсу (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get students by course ID) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Get students by course ID) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-
         group = await group_service.get_students_by_course_id(db, course_id)
         if not group:
             raise HTTPException(status_code=404, detail="Course not found")
@@ -0,0 +1,195 @@
+import logging
+import traceback
+
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from db.db_config import get_db, AsyncSessionLocal
+
+from services.auth_service import require_role
+from services.journal_service import JournalService, JournalConflictError
+from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
+from models.schemas.journal_schemas import JournalStudentAverageSchema, JournalTaskStatsSchema, JournalBulkMarkSchema, JournalMarkResultSchema
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+journal_router = APIRouter(prefix="/journal")
+
+
+@journal_router.get(
+    "/course/{course_id}",
+    tags=["Journal"],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Course gradebook, one JSON line per student"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def get_course_gradebook(
+    course_id: int,
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    journal_service: JournalService = Depends(JournalService)
+    ) -> StreamingResponse:
+    """
+    Ведомость курса: оценки всех студентов по всем заданиям (только для администратора)
+    """
+    # Сессия из get_db закрывается до отправки тела ответа,
+    # поэтому поток читается в собственной сессии
+    async def gradebook_lines():
+        async with AsyncSessionLocal() as db:
+            async for line in journal_service.stream_gradebook(db, course_id):
+                yield line
+
+    logger.info(f"(Get course gradebook) Streaming gradebook of course {course_id}")
+    return StreamingResponse(gradebook_lines(), media_type="application/x-ndjson")
+
+@journal_router.get(
+    "/course/{course_id}/students",
+    tags=["Journal"],
+    response_model=List[JournalStudentAverageSchema],
+    responses={
+        200: {
+            "model": List[JournalStudentAverageSchema],
+            "description": "Average marks of the course students"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def get_student_averages(
+    course_id: int,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    journal_service: JournalService = Depends(JournalService)
+    ) -> List[JournalStudentAverageSchema]:
+    """
+    Средние оценки студентов курса с местом в рейтинге (только для администратора)
+    """
+    try:
+        students = await journal_service.get_student_averages(db, course_id)
+        logger.info(f"(Get student averages) Retrieved {len(students)} students")
+        return students
+
+    except Exception as e:
+        logger.error(f"(Get student averages) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@journal_router.get(
+    "/course/{course_id}/tasks",
+    tags=["Journal"],
+    response_model=List[JournalTaskStatsSchema],
+    responses={
+        200: {
+            "model": List[JournalTaskStatsSchema],
+            "description": "Mark statistics of the course tasks"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def get_task_stats(
+    course_id: int,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    journal_service: JournalService = Depends(JournalService)
+    ) -> List[JournalTaskStatsSchema]:
+    """
+    Статистика оценок по заданиям курса (только для администратора)
+    """
+    try:
+        tasks = await journal_service.get_task_stats(db, course_id)
+        logger.info(f"(Get task stats) Retrieved {len(tasks)} tasks")
+        return tasks
+
+    except Exception as e:
+        logger.error(f"(Get task stats) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@journal_router.put(
+    "/marks",
+    tags=["Journal"],
+    response_model=List[JournalMarkResultSchema],
+    responses={
+        200: {
+            "model": List[JournalMarkResultSchema],
+            "description": "Marks saved successfully"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        409: {
+            "model": ErrorSchema,
+            "description": "Journal entries changed or not found, nothing saved"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def submit_marks(
+    marks_data: JournalBulkMarkSchema,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    journal_service: JournalService = Depends(JournalService)
+    ) -> List[JournalMarkResultSchema]:
+    """
+    Массовое выставление оценок и комментариев (только для администратора)
+    """
+    try:
+        marks = await journal_service.submit_marks(db, marks_data.marks)
+        logger.info(f"(Submit marks) Saved {len(marks)} marks")
+        return marks
+
+    except JournalConflictError as e:
+        logger.warning(f"(Submit marks) Conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"(Submit marks) Error: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,17 +1,18 @@
 import logging
 
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from db.db_config import get_db
-from config import oauth2_scheme
+from db.pagination import next_cursor
 
-from services.auth_service import AuthService
+from services.auth_service import require_role
 from services.task_service import TaskService
 from models.schemas.error_schemas import ErrorSchema
+from models.schemas.access_token_schemas import PrincipalSchema
 from models.schemas.message_schemas import MessageSchema 
-from models.schemas.task_schemas import TaskSchema, TaskCreateSchema, TaskUpdateSchema, TaskStatus
+from models.schemas.task_schemas import TaskSchema, TaskCreateSchema, TaskBulkCreateSchema, TaskUpdateSchema, TaskStatus, TaskBulkStatusSchema, TaskBulkStatusResultSchema
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -49,25 +50,13 @@ task_router = APIRouter(prefix="/task")
 async def create_task(
             task_data: TaskCreateSchema,
             db: AsyncSession = Depends(get_db),
-            access_token: str = Depends(oauth2_scheme),
+            principal: PrincipalSchema = Depends(require_role("admin")),
             task_service: TaskService = Depends(TaskService),
-            auth_service: AuthService = Depends(AuthService)
     ) -> MessageSchema:
     """
     Создание задания (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Create task) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Create task) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-
         task = await task_service.create_task(
             db = db, 
             name=task_data.name,
@@ -95,6 +84,64 @@ async def create_task(
         logger.error(f"(Create task) Error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@task_router.post(
+    "/bulk",
+    tags=["Task"],
+    response_model=List[TaskSchema],
+    responses={
+        200: {
+            "model": List[TaskSchema],
+            "description": "Tasks created successful"
+        },
+        400: {
+            "model": ErrorSchema,
+            "description": "Invalid input data"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def create_tasks(
+            tasks_data: TaskBulkCreateSchema,
+            db: AsyncSession = Depends(get_db),
+            principal: PrincipalSchema = Depends(require_role("admin")),
+            task_service: TaskService = Depends(TaskService)
+    ) -> List[TaskSchema]:
+    """
+    Массовое создание заданий (только для администратора)
+    """
+    try:
+        tasks = await task_service.create_tasks(
+            db = db,
+            tasks_data=[task_data.model_dump() for task_data in tasks_data.tasks]
+        )
+
+        if tasks is None:
+            logger.warning("(Create tasks) Some of the courses not found")
+            raise HTTPException(status_code=400, detail="Invalid input data")
+
+        logger.info(f"(Create tasks) {len(tasks)} tasks successfully created")
+        return tasks
+
+    except HTTPException:
+        raise
+    except ValueError as validation_error:
+        logger.warning(f"(Create tasks) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Create tasks) Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @task_router.get(
     "",
     tags=["Task"],
@@ -118,33 +165,39 @@ async def create_task(
     }
 )
 async def get_tasks(
+    response: Response,
     skip: int = 0, 
     limit: int = 50,
+    cursor: Optional[str] = None,
+    course_id: Optional[int] = None,
+    task_status: Optional[List[TaskStatus]] = Query(None),
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin", "student")),
     task_service: TaskService = Depends(TaskService)
     ) -> List[TaskSchema]:
     """
-    Получение списка заданий (только для администратора)
+    Получение списка заданий с фильтром по курсу и статусам (по умолчанию без удалённых)
     """
     try:
+        tasks = await task_service.get_tasks(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            course_id=course_id,
+            statuses=[status.value for status in task_status] if task_status else None
+        )
 
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get tasks) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin" or role != "student":
-            logger.warning(f"(Get tasks) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
+        page_cursor = next_cursor(tasks, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
-        tasks = await task_service.get_tasks(db, skip=skip, limit=limit)
         logger.info(f"(Get tasks) Successfully retrieved {len(tasks)} task")
         return tasks
     
+    except ValueError as validation_error:
+        logger.warning(f"(Get tasks) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get tasks) Error: {e}", exc_info=True)
         raise HTTPException(
@@ -181,24 +234,13 @@ async def get_tasks(
 async def get_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin", "student")),
     task_service: TaskService = Depends(TaskService)
     ) -> TaskSchema:
     """
     Получение задания по ID (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get task by ID) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin" or role != "student":
-            logger.warning(f"(Get task by ID) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
         task = await task_service.get_task_by_id(db, task_id)
 
         if not task:
@@ -253,25 +295,13 @@ async def update_task(
     task_id: int,
     task_data: TaskUpdateSchema,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     task_service: TaskService = Depends(TaskService)
     ) -> MessageSchema:
     """
     Изменение данных задания (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Update task) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Update task) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         updated_task = await task_service.update_task(
             db = db,
             task_id=task_id,
@@ -343,25 +373,13 @@ async def update_status_task(
     task_id: int,
     task_status: str,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     task_service: TaskService = Depends(TaskService)
     ) -> MessageSchema:
     """
     Изменение статуса задания (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Update status task) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin" or role != "student":
-            logger.warning(f"(Update status task) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         if task_status not in TaskStatus:
             logger.warning(f"(Update status task) Status {task_status} doesnt exist")
             raise HTTPException(status_code=400, detail=f"Task status '{task_status}' not exsist")
@@ -398,6 +416,80 @@ async def update_status_task(
         logger.error(f"(Update status task) Error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@task_router.put(
+    "/course/{course_id}/status",
+    tags=["Task"],
+    response_model=TaskBulkStatusResultSchema,
+    responses={
+        200: {
+            "model": TaskBulkStatusResultSchema,
+            "description": "Tasks status updated"
+        },
+        400: {
+            "model": ErrorSchema,
+            "description": "Status transition not allowed"
+        },
+        401:{
+            "model": ErrorSchema,
+            "description": "Unauthorized"
+        },
+        403:{
+            "model": ErrorSchema,
+            "description": "Bad token"
+        },
+        404: {
+            "model": ErrorSchema,
+            "description": "Course not found"
+        },
+        500: {
+            "model": ErrorSchema,
+            "description": "Internal server error"
+        }
+    }
+)
+async def update_status_tasks(
+    course_id: int,
+    status_data: TaskBulkStatusSchema,
+    db: AsyncSession = Depends(get_db),
+    principal: PrincipalSchema = Depends(require_role("admin")),
+    task_service: TaskService = Depends(TaskService)
+    ) -> TaskBulkStatusResultSchema:
+    """
+    Массовое изменение статуса заданий курса (только для администратора)
+    """
+    try:
+        updated_ids = await task_service.update_tasks_status(
+            db = db,
+            course_id=course_id,
+            status=status_data.status.value,
+            task_ids=status_data.task_ids,
+            from_statuses=[value.value for value in status_data.from_statuses] if status_data.from_statuses is not None else None
+        )
+
+        if updated_ids is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"(Update status tasks) Course with id {course_id} not found"
+            )
+
+        skipped_ids = sorted(set(status_data.task_ids or []) - set(updated_ids))
+
+        logger.info(f"(Update status tasks) Updated {len(updated_ids)} tasks, skipped {len(skipped_ids)}")
+        return TaskBulkStatusResultSchema(
+            course_id=course_id,
+            status=status_data.status,
+            updated_ids=updated_ids,
+            skipped_ids=skipped_ids
+        )
+    except HTTPException:
+        raise
+    except ValueError as validation_error:
+        logger.warning(f"(Update status tasks) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
+    except Exception as e:
+        logger.error(f"(Update status tasks) Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @task_router.put(
     "/{task_id}/delete",
     tags=["Task"],
@@ -428,31 +520,18 @@ async def update_status_task(
 async def soft_delete_task(
         task_id: int,
         db: AsyncSession = Depends(get_db),
-        access_token: str = Depends(oauth2_scheme),
-        auth_service: AuthService = Depends(AuthService),
+        principal: PrincipalSchema = Depends(require_role("admin")),
         task_service: TaskService = Depends(TaskService)
     ) -> MessageSchema:
     """
     Изменения статуса задания на удалённый (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Delete status task) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Delete status task) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         deleted_task = await task_service.delete_status_task(db, task_id)
 
         if not deleted_task:
             raise HTTPException(status_code=404,detail=f"(Delete status task) Task with ID {task_id} not found")
-        
-        
+
         if deleted_task == None:
             return MessageSchema(messageDigest=str(task_id), description=f"(Delete status task) Task with ID {task_id} was already marked as deleted")
         
@@ -497,25 +576,13 @@ async def soft_delete_task(
 async def hard_delete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    access_token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(AuthService),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     task_service: TaskService = Depends(TaskService)
     ) -> MessageSchema:
     """
     Удаление задания (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Delete task) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
-
-        if role != "admin":
-            logger.warning(f"(Delete task) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
         deleted_task = await task_service.delete_task(db, task_id)
 
         if not deleted_task:
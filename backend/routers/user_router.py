@@ -1,20 +1,19 @@
 import traceback
 import logging
 
-from typing import List
-from jose import JWTError
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from db.db_config import get_db
-from config import oauth2_scheme
+from db.pagination import next_cursor
 
-from services.auth_service import AuthService
+from services.auth_service import AuthService, PasswordHashBusyError, get_current_principal, require_role
 from services.user_service import UserService
 
 from models.schemas.error_schemas import ErrorSchema
 from models.schemas.message_schemas import MessageSchema
-from models.schemas.access_token_schemas import AccessTokenSchema
+from models.schemas.access_token_schemas import AccessTokenSchema, PrincipalSchema
 from models.schemas.user_schemas import UserRegistrationSchema, UserProfileAdminSchema, UserLoginSchema, UserProfileSchema, UserSchema, UserProfileUpdateSchema, UserRoleStatus
 
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +34,10 @@ user_router = APIRouter(prefix="/user")
             "model": ErrorSchema,
             "description": "Invalid input data"
         },
+        503: {
+            "model": ErrorSchema,
+            "description": "Server is busy"
+        },
         500:{
             "model": ErrorSchema,
             "description": "Internal server error"
@@ -75,6 +78,9 @@ async def user_register(
     except ValueError as validation_error:
         logger.warning(f"(User registration) Validation error: {validation_error}")
         raise HTTPException(status_code=400, detail=str(validation_error))
+    except PasswordHashBusyError as e:
+        logger.warning(f"(User registration) Password hashing is busy: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, try again later", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"(User registration) Error {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -92,6 +98,10 @@ async def user_register(
             "model": ErrorSchema,
             "description": "Invalid input data"
         },
+        503: {
+            "model": ErrorSchema,
+            "description": "Server is busy"
+        },
         500:{
             "model": ErrorSchema,
             "description": "Internal server error"
@@ -108,12 +118,12 @@ async def login(
     Авторизация пользователя
     """
     try:
-        if not await user_service.verify_password(db, user_data.email, user_data.password):
+        user = await user_service.authenticate(db, user_data.email, user_data.password)
+
+        if not user:
             logger.warning(f"(Login) Failed login for user with email: {user_data.email}")
             raise HTTPException(status_code=400, detail="Invalid credentials")
 
-        user = await user_service.get_user_by_email(db,  user_data.email)
-
         access_token = await auth_service.create_access_token(
             data={
                 "sub": str(user.id),
@@ -127,6 +137,9 @@ async def login(
     
     except HTTPException:
         raise
+    except PasswordHashBusyError as e:
+        logger.warning(f"(Login) Password hashing is busy: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, try again later", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"(Registration) Error {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -154,7 +167,7 @@ async def login(
     }
 )
 async def logout(
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(AuthService),
     ) -> MessageSchema:
@@ -162,17 +175,10 @@ async def logout(
     Выход из учётной записи
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Logout) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        await auth_service.revoke_access_token(db, access_token)
-        logger.info(f"(Logout) Token was revoked: {access_token}")
+        await auth_service.revoke_access_token(db, principal.access_token)
+        logger.info(f"(Logout) Token was revoked: {principal.access_token}")
         return MessageSchema(description="Token was successfully revoked")
     
-    except JWTError as e:
-        logger.warning(f"(Logout) Bad token {e}")
-        raise HTTPException(status_code=403, detail="Bad token")
     except HTTPException:
         raise
     except Exception as e:
@@ -207,37 +213,32 @@ async def logout(
     }
 )
 async def get_profiles(
+    response: Response,
     skip: int = 0,
     limit: int = 25,
-    access_token: str = Depends(oauth2_scheme),
+    cursor: Optional[str] = None,
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(UserService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> List[UserSchema]:
     """
     Получение списка пользователей (только для администратора)
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get users profiles) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-        
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        role = token_data["role"]
+        users = await user_service.get_all_users(db, skip, limit, cursor)
+
+        page_cursor = next_cursor(users, limit, "id")
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
 
-        if role != "admin":
-            logger.warning(f"(Get users profiles) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
-        users = await user_service.get_all_users(db, skip, limit)
         logger.info(f"(Get users profile) Successfully retrived {len(users)} user")
         return users
     
-    except JWTError as e:
-        logger.warning(f"(Get users profiles) Bad token: {e}")
-        raise HTTPException(status_code=403, detail="Bad token")
     except HTTPException:
         raise
+    except ValueError as validation_error:
+        logger.warning(f"(Get users profiles) Validation error: {validation_error}")
+        raise HTTPException(status_code=400, detail=str(validation_error))
     except Exception as e:
         logger.error(f"(Get users profiles) Error: {e}")
         logger.error(traceback.format_exc())
@@ -271,27 +272,18 @@ async def get_profiles(
     }
 )
 async def get_profile(
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(UserService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> UserProfileSchema:
     """
     Получение данных пользователя
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Get user profile) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        user = await user_service.get_user_by_id(db, token_data["sub"])
+        user = await user_service.get_user_by_id(db, principal.sub)
         logger.info(f"(Get user profile) Successful get profile with id: {user.id}")
         return user
     
-    except JWTError as e:
-        logger.warning(f"(Get user profile) Bad token: {e}")
-        raise HTTPException(status_code=403, detail="Bad token")
     except HTTPException:
         raise
     except Exception as e:
@@ -331,21 +323,15 @@ async def get_profile(
 )
 async def update_profile(
     user_data: UserProfileUpdateSchema,
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(UserService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> MessageSchema:
     """
     Обвновление данных пользователя
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Update user profile) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        user = await user_service.get_user_by_id(db, token_data["sub"])
+        user = await user_service.get_user_by_id(db, principal.sub)
 
         if not user:
             raise HTTPException(
@@ -370,9 +356,6 @@ async def update_profile(
             messageDigest=str(user.id),
             description=f"(Update user profile) User '{user.name}' updated successfully"
         )
-    except JWTError as e:
-        logger.warning(f"(Update user profile) Bad token: {e}")
-        raise HTTPException(status_code=403, detail="Bad token")
     except HTTPException:
         raise
     except Exception as e:
@@ -412,22 +395,15 @@ async def update_profile(
 )
 async def update_status_profile(
     user_data: UserProfileAdminSchema,
-    access_token: str = Depends(oauth2_scheme),
+    principal: PrincipalSchema = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(UserService),
-    auth_service: AuthService = Depends(AuthService)
     ) -> MessageSchema:
     """
     Обновление статуса пользователя
     """
     try:
-        if await auth_service.check_revoked(db, access_token):
-            logger.warning(f"(Update user status) Token is revoked: {access_token}")
-            raise HTTPException(status_code=403, detail="Token revoked")
-
-        token_data = await auth_service.get_data_from_access_token(access_token)
-        user = await user_service.get_user_by_id(db, token_data["sub"])
-        role = token_data["role"]
+        user = await user_service.get_user_by_id(db, principal.sub)
 
         if user_data.role not in UserRoleStatus:
             logger.warning(f"(Update user status) Status {user_data.role} doesnt exist")
@@ -438,11 +414,7 @@ async def update_status_profile(
                 status_code=404,
                 detail=f"(Update user profile) User with ID {user.id} not found"
             )
-        
-        if role != "admin":
-            logger.warning(f"(Update user status) Bad token: {access_token}")
-            raise HTTPException(status_code=403, detail="Not allowed")
-        
+
         update_user_status = await user_service.update_user_status(
             db = db, 
             _id = user_data.id, 
@@ -459,9 +431,6 @@ async def update_status_profile(
             messageDigest=str(user_data.id),
             description=f"(Update user status) User status updated successfully"
         )
-    except JWTError as e:
-        logger.warning(f"(Update user status) Bad token: {e}")
-        raise HTTPException(status_code=403, detail="Bad token")
     except HTTPException:
         raise
     except Exception as e:
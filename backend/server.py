@@ -9,13 +9,19 @@ from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
+from db.db_config import AsyncSessionLocal
 from db.db_init import db_init
+from services.revocation_cache import revocation_cache
+from services.auth_service import password_executor
+from services.backup_jobs import backup_jobs
+from services.backup_scheduler import backup_scheduler
 
 from routers.applicatoin_router import application_router
 from routers.auth_router import auth_router
 from routers.backup_router import backup_router
 from routers.course_router import course_router
 from routers.group_router import group_router
+from routers.journal_router import journal_router
 from routers.task_router import task_router
 from routers.user_router import user_router
 
@@ -29,13 +35,20 @@ router.include_router(auth_router)
 router.include_router(backup_router)
 router.include_router(course_router)
 router.include_router(group_router)
+router.include_router(journal_router)
 router.include_router(task_router)
 router.include_router(user_router)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_init()
+    async with AsyncSessionLocal() as db:
+        await revocation_cache.warm(db)
+    backup_scheduler.start()
     yield
+    await backup_scheduler.shutdown()
+    await backup_jobs.shutdown()
+    password_executor.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -7,6 +7,7 @@ from email_validator import validate_email, EmailNotValidError
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from db.pagination import apply_cursor
 from models.tables.application import Application
 
 class ApplicationService:
@@ -82,9 +83,14 @@ class ApplicationService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def get_applications(self, db: AsyncSession, skip = 0, limit = 50) -> List[Application]:
+    async def get_applications(self, db: AsyncSession, skip = 0, limit = 50, cursor: Optional[str] = None) -> List[Application]:
         try:
-            applications = (await db.scalars(select(Application).offset(skip).limit(limit))).all()
+            # Сначала новые заявки
+            query = apply_cursor(select(Application), cursor, Application.application_date, Application.id, descending=True)
+            if not cursor:
+                query = query.offset(skip)
+
+            applications = (await db.scalars(query.limit(limit))).all()
             self.logger.info(f"(Get applications) Retrived {len(applications)} applications")
             return applications
         except Exception as e:
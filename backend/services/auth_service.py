@@ -1,20 +1,51 @@
+import asyncio
 import logging
 import traceback
 from jose import jwt
 from jose import JWTError
 
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from fastapi import Depends, HTTPException, Request
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.db_config import get_db
 from models.tables.user import CRL
+from models.schemas.access_token_schemas import PrincipalSchema
+from services.revocation_cache import revocation_cache
 from authlib.integrations.starlette_client import OAuth
-from config import oauth2_scheme, ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, JWT_SECRET_KEY, YANDEX_CLIENT_ID, YANDEX_CLIENT_SECRET, VK_CLIENT_ID, VK_CLIENT_SECRET
+from config import oauth2_scheme, ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, JWT_SECRET_KEY, YANDEX_CLIENT_ID, YANDEX_CLIENT_SECRET, VK_CLIENT_ID, VK_CLIENT_SECRET, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt занимает ~100 мс CPU, поэтому выполняется вне event loop
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_jobs = 0
+
+
+class PasswordHashBusyError(Exception):
+    """
+    Очередь на хэширование паролей заполнена
+    """
+    pass
+
+
+async def _run_password_job(func, *args):
+    global _password_jobs
+
+    if _password_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+        raise PasswordHashBusyError("Password hashing queue is full")
+
+    _password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _password_jobs -= 1
+
 oauth = OAuth()
 
 class AuthService:
@@ -53,12 +84,12 @@ class AuthService:
     )
 
     @staticmethod
-    def get_hashed_password(password: str) -> str:
-        return password_context.hash(password)
+    async def get_hashed_password(password: str) -> str:
+        return await _run_password_job(password_context.hash, password)
     
     @staticmethod
-    def verify_hashed_password(plain_password: str, hashed_password: str) -> bool:
-        return password_context.verify(plain_password, hashed_password)
+    async def verify_hashed_password(plain_password: str, hashed_password: str) -> bool:
+        return await _run_password_job(password_context.verify, plain_password, hashed_password)
     
     """
     В токене хранится:
@@ -105,6 +136,7 @@ class AuthService:
             db.add(crl_entry)
             await db.commit()
             await db.refresh(crl_entry)
+            revocation_cache.add(token, crl_entry.id)
             self.logger.info(f"(Revoke access token) Token revoked: {token}")
         except Exception as e:
             self.logger.error(f"(Revoke access token) Error token revoked: {e}")
@@ -114,7 +146,19 @@ class AuthService:
     
     async def check_revoked(self, db: AsyncSession, token: str) -> bool:
         try:
+            await revocation_cache.sync(db)
+
+            if revocation_cache.is_revoked(token):
+                self.logger.info(f"(Check revoked access token) Token revoked: {token}")
+                return True
+
+            # Фильтр Блума не даёт ложноотрицательных ответов, поэтому в базу
+            # идём только при возможном совпадении
+            if not revocation_cache.might_be_revoked(token):
+                return False
+
             if (await db.scalars(select(CRL).where(CRL.token == token))).first():
+                revocation_cache.add(token)
                 self.logger.info(f"(Check revoked access token) Token revoked: {token}")
                 return True
             else:
@@ -142,4 +186,57 @@ class AuthService:
             return role
         except JWTError as e:
             self.logger.error(f"Invalid token: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+async def get_current_principal(
+    request: Request,
+    access_token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+    ) -> PrincipalSchema:
+    """
+    Проверка токена и получение данных пользователя.
+    Выполняется один раз за запрос: FastAPI кэширует результат зависимости,
+    а сам пользователь сохраняется в request.state.principal
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    auth_service = AuthService()
+    try:
+        if await auth_service.check_revoked(db, access_token):
+            auth_service.logger.warning(f"(Get current principal) Token is revoked: {access_token}")
+            raise HTTPException(status_code=403, detail="Token revoked")
+
+        token_data = await auth_service.get_data_from_access_token(access_token)
+        principal = PrincipalSchema(
+            sub=str(token_data["sub"]),
+            role=str(token_data["role"]),
+            access_token=access_token
+        )
+    except HTTPException:
+        raise
+    except (JWTError, KeyError) as e:
+        auth_service.logger.warning(f"(Get current principal) Bad token: {e}")
+        raise HTTPException(status_code=403, detail="Bad token")
+    except Exception as e:
+        auth_service.logger.error(f"(Get current principal) Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    request.state.principal = principal
+    return principal
+
+
+def require_role(*roles: str):
+    """
+    Зависимость, пропускающая только пользователей с одной из указанных ролей:
+        principal: PrincipalSchema = Depends(require_role("admin"))
+    """
+    async def role_guard(principal: PrincipalSchema = Depends(get_current_principal)) -> PrincipalSchema:
+        if principal.role not in roles:
+            logging.getLogger(__name__).warning(f"(Require role) Role '{principal.role}' not allowed: {principal.access_token}")
+            raise HTTPException(status_code=403, detail="Not allowed")
+        return principal
+
+    return role_guard
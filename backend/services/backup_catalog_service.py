@@ -0,0 +1,153 @@
+import os
+import asyncio
+import logging
+import traceback
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.pagination import apply_cursor
+from models.tables.backup import BackupCatalog
+from services.backup_service import BackupService, BackupChecksumError, backup_checksum
+
+
+class BackupCatalogService:
+    def __init__(self):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+        self.backup_service = BackupService()
+
+    async def add_entry(self,
+                        db: AsyncSession,
+                        backup_file: str,
+                        backup_format: str,
+                        table_rows: Dict[str, int],
+                        duration_seconds: float,
+                        size: Optional[int] = None,
+                        sha256: Optional[str] = None) -> BackupCatalog:
+        """
+        Записывает резервную копию в каталог. Если размер и SHA-256 не посчитаны
+        при записи копии, файл читается по частям в отдельном потоке
+        """
+        try:
+            backup_file = os.path.abspath(backup_file)
+            if size is None or sha256 is None:
+                size, sha256 = await asyncio.to_thread(backup_checksum, backup_file)
+
+            values = {
+                "backup_format": backup_format,
+                "size": size,
+                "sha256": sha256,
+                "pg_dump_version": await self.backup_service.get_pg_dump_version(),
+                "table_rows": table_rows,
+                "duration_seconds": duration_seconds,
+            }
+            entry = (
+                await db.scalars(
+                    insert(BackupCatalog)
+                    .values(backup_file=backup_file, **values)
+                    .on_conflict_do_update(index_elements=[BackupCatalog.backup_file], set_=values)
+                    .returning(BackupCatalog)
+                    )
+                ).first()
+            await db.commit()
+
+            self.logger.info(f"(Add catalog entry) {backup_file}: {size} bytes, sha256 {sha256}")
+            return entry
+
+        except Exception as e:
+            self.logger.error(f"(Add catalog entry) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            await db.rollback()
+            raise
+
+    async def get_entries(self,
+                          db: AsyncSession,
+                          skip: int = 0,
+                          limit: int = 50,
+                          cursor: Optional[str] = None) -> List[BackupCatalog]:
+        """
+        Каталог резервных копий, новые первыми. Один запрос к backup_catalog,
+        файлы копий не читаются
+        """
+        try:
+            query = apply_cursor(select(BackupCatalog), cursor, BackupCatalog.id, descending=True)
+            if not cursor:
+                query = query.offset(skip)
+
+            entries = (
+                await db.scalars(
+                    query
+                    .limit(limit)
+                    )
+                ).all()
+            self.logger.info(f"(Get catalog entries) Retrieved {len(entries)} entries")
+            return entries
+
+        except Exception as e:
+            self.logger.error(f"(Get catalog entries) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def get_entry_by_id(self, db: AsyncSession, entry_id: int) -> Optional[BackupCatalog]:
+        try:
+            entry = await db.get(BackupCatalog, entry_id)
+            if not entry:
+                self.logger.warning(f"(Get catalog entry) Entry with ID {entry_id} not found")
+            return entry
+
+        except Exception as e:
+            self.logger.error(f"(Get catalog entry) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def get_entry_by_file(self, db: AsyncSession, backup_file: str) -> Optional[BackupCatalog]:
+        try:
+            return (
+                await db.scalars(
+                    select(BackupCatalog)
+                    .where(BackupCatalog.backup_file == os.path.abspath(backup_file))
+                    )
+                ).first()
+
+        except Exception as e:
+            self.logger.error(f"(Get catalog entry by file) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def verify_entry(self, entry: BackupCatalog) -> None:
+        """
+        Сверяет размер и SHA-256 файла с каталогом. Файл читается
+        по частям в отдельном потоке и в память целиком не загружается.
+
+        :raises ValueError: Если файла копии больше нет.
+        :raises BackupChecksumError: Если копия изменилась или повреждена.
+        """
+        if not os.path.exists(entry.backup_file):
+            raise ValueError(f"Backup file not found: {entry.backup_file}")
+
+        size, sha256 = await asyncio.to_thread(backup_checksum, entry.backup_file)
+        if size != entry.size or sha256 != entry.sha256:
+            self.logger.error(f"(Verify backup) Checksum mismatch for {entry.backup_file}: expected {entry.sha256}, got {sha256}")
+            raise BackupChecksumError(f"Backup checksum mismatch: {entry.backup_file}")
+
+        self.logger.info(f"(Verify backup) Checksum OK: {entry.backup_file}")
+
+    async def verify_backup(self, db: AsyncSession, backup_file: str) -> BackupCatalog:
+        """
+        Проверка копии перед восстановлением: копия должна быть в каталоге
+        и совпадать с ним.
+
+        :raises ValueError: Если копии нет в каталоге или на диске.
+        :raises BackupChecksumError: Если контрольная сумма не совпадает.
+        """
+        entry = await self.get_entry_by_file(db, backup_file)
+        if entry is None:
+            raise ValueError(f"Backup is not in the catalog: {backup_file}")
+
+        await self.verify_entry(entry)
+        return entry
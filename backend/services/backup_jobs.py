@@ -0,0 +1,319 @@
+import os
+import re
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+import traceback
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from db.db_config import AsyncSessionLocal
+from services.backup_service import BackupService
+from services.backup_catalog_service import BackupCatalogService
+from services.backup_store import backup_store
+from config import BACKUP_DIR, BACKUP_JOB_HISTORY
+
+
+# Строки подробного вывода (-v), по которым считается прогресс.
+# Без -j таблица считается выгруженной, когда начинается следующая,
+# с -j pg_dump/pg_restore сообщают о завершении каждой таблицы
+TABLE_STARTED = re.compile(r'(dumping contents of table|processing data for table) "')
+TABLE_FINISHED = re.compile(r'finished item \d+ TABLE DATA ')
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class BackupJobConflictError(Exception):
+    """
+    Восстановление уже запущено или стоит в очереди
+    """
+    pass
+
+
+class BackupJob:
+    """
+    Фоновая задача создания или восстановления резервной копии
+    """
+    def __init__(self,
+                 kind: str,
+                 jobs: int = 1,
+                 backup_format: Optional[str] = None,
+                 backup_dir: Optional[str] = None,
+                 backup_file: Optional[str] = None,
+                 snapshot: Optional[str] = None,
+                 to_store: bool = False):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.jobs = jobs
+        self.backup_format = backup_format
+        self.backup_dir = backup_dir
+        self.backup_file = backup_file
+        # Копия в хранилище с дедупликацией: результат дампа или источник восстановления
+        self.snapshot = snapshot
+        self.to_store = to_store
+        self.tables_done = 0
+        self.tables_total: Optional[int] = None
+        self.error: Optional[str] = None
+        self.catalog_id: Optional[int] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+        self._tables_started = 0
+        self._tables_finished = 0
+        self._task: Optional[asyncio.Task] = None
+        self._exception: Optional[Exception] = None
+        self._done = asyncio.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def track_progress(self, line: str) -> None:
+        if TABLE_FINISHED.search(line):
+            self._tables_finished += 1
+        elif TABLE_STARTED.search(line):
+            self._tables_started += 1
+        else:
+            return
+
+        done = self._tables_finished or max(self._tables_started - 1, 0)
+        if self.tables_total is not None:
+            done = min(done, self.tables_total)
+        self.tables_done = done
+
+    def finish(self, status: str, exception: Optional[Exception] = None) -> None:
+        self.status = status
+        self.error = str(exception) if exception else None
+        self._exception = exception
+        self.finished_at = datetime.now()
+        self._done.set()
+
+    async def wait(self) -> None:
+        await self._done.wait()
+
+    def raise_for_error(self) -> None:
+        """
+        Повторно выбрасывает исключение, с которым завершилась задача
+        """
+        if self._exception is not None:
+            raise self._exception
+
+
+class BackupJobManager:
+    """
+    Очередь фоновых задач pg_dump/pg_restore.
+
+    Задачи выполняются по одной в порядке поступления: дампы ждут в очереди,
+    восстановление не пересекается ни с дампом, ни с другим восстановлением.
+    Через очередь же идут запись в хранилище копий и очистка по политике
+    хранения, поэтому они не пересекаются с восстановлением из хранилища.
+    Состояние задач хранится в памяти процесса, завершённые задачи
+    вытесняются после BACKUP_JOB_HISTORY. При остановке приложения
+    запущенный процесс завершается (shutdown), а не остаётся сиротой.
+    """
+    def __init__(self, history: int = BACKUP_JOB_HISTORY):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+        self.history = history
+        self.backup_service = BackupService()
+        self.catalog_service = BackupCatalogService()
+
+        self._jobs: "OrderedDict[str, BackupJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _enqueue(self, job: BackupJob) -> BackupJob:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._work())
+
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._trim_history()
+
+        self.logger.info(f"(Backup jobs) Job {job.id} ({job.kind}) queued")
+        return job
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+    def submit_backup(self,
+                      backup_format: str = "custom",
+                      jobs: int = 1,
+                      backup_dir: str = BACKUP_DIR,
+                      to_store: bool = False) -> BackupJob:
+        """
+        Ставит создание резервной копии в очередь. С to_store копия
+        в формате directory переносится в хранилище с дедупликацией.
+
+        :raises ValueError: Если параметры дампа недопустимы.
+        """
+        self.backup_service.check_jobs(jobs, backup_format)
+        if to_store:
+            if backup_format != "directory":
+                raise ValueError("Only directory format backups can be stored")
+            backup_dir = backup_store.staging_dir
+
+        return self._enqueue(BackupJob("backup", jobs, backup_format=backup_format, backup_dir=backup_dir, to_store=to_store))
+
+    def submit_restore(self, backup_file: Optional[str] = None, jobs: int = 1, snapshot: Optional[str] = None) -> BackupJob:
+        """
+        Ставит восстановление из файла (каталога) или копии из хранилища в очередь.
+
+        :raises ValueError: Если резервная копия не найдена или jobs недопустим.
+        :raises BackupJobConflictError: Если другое восстановление ещё не завершено.
+        """
+        self.backup_service.check_jobs(jobs)
+        if snapshot is not None:
+            if backup_store.get_snapshot(snapshot) is None:
+                raise ValueError(f"Snapshot not found: {snapshot}")
+        elif not backup_file or not os.path.exists(backup_file):
+            raise ValueError(f"Backup not found: {backup_file}")
+
+        pending = next((job for job in self._jobs.values() if job.kind == "restore" and job.active), None)
+        if pending:
+            raise BackupJobConflictError(f"Restore job {pending.id} is already {pending.status}")
+
+        return self._enqueue(BackupJob("restore", jobs, backup_file=backup_file, snapshot=snapshot))
+
+    def get_job(self, job_id: str) -> Optional[BackupJob]:
+        return self._jobs.get(job_id)
+
+    def get_jobs(self) -> List[BackupJob]:
+        return list(reversed(self._jobs.values()))
+
+    async def cancel(self, job_id: str) -> Optional[BackupJob]:
+        """
+        Отменяет задачу: из очереди она просто снимается, у запущенной
+        завершается процесс. Возвращает None, если задача не найдена
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        if job.status == "queued":
+            job.finish("cancelled")
+            self.logger.info(f"(Backup jobs) Job {job.id} cancelled before start")
+        elif job.status == "running" and job._task is not None:
+            job._task.cancel()
+            await asyncio.wait([job._task])
+
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status != "queued":
+                    continue
+                job._task = asyncio.create_task(self._execute(job))
+                # wait, а не await: отмена задачи не должна останавливать очередь
+                await asyncio.wait([job._task])
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: BackupJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.now()
+        self.logger.info(f"(Backup jobs) Job {job.id} ({job.kind}) started")
+
+        try:
+            if job.kind == "backup":
+                await self._create_backup(job)
+            elif job.snapshot is not None:
+                await self._restore_snapshot(job)
+            else:
+                # Восстанавливаются только копии из каталога с совпадающей контрольной суммой
+                async with AsyncSessionLocal() as db:
+                    entry = await self.catalog_service.verify_backup(db, job.backup_file)
+                job.catalog_id = entry.id
+                job.tables_total = await self.backup_service.count_backup_tables(job.backup_file)
+                await self.backup_service.restore_backup(job.backup_file, job.jobs, job.track_progress)
+
+            job.tables_done = job.tables_total
+            job.finish("succeeded")
+            self.logger.info(f"(Backup jobs) Job {job.id} ({job.kind}) succeeded")
+
+        except asyncio.CancelledError:
+            job.finish("cancelled")
+            self.logger.warning(f"(Backup jobs) Job {job.id} ({job.kind}) cancelled, process terminated")
+            raise
+        except Exception as e:
+            job.finish("failed", e)
+            self.logger.error(f"(Backup jobs) Job {job.id} ({job.kind}) Error: {e}")
+            self.logger.error(traceback.format_exc())
+
+    async def _create_backup(self, job: BackupJob) -> None:
+        async with AsyncSessionLocal() as db:
+            table_rows = await self.backup_service.get_table_rows(db)
+        job.tables_total = len(table_rows)
+
+        started = time.monotonic()
+        job.backup_file = await self.backup_service.create_backup(
+            job.backup_dir, job.backup_format, job.jobs, job.track_progress
+        )
+        duration_seconds = time.monotonic() - started
+
+        if job.to_store:
+            await self._store_backup(job)
+            return
+
+        async with AsyncSessionLocal() as db:
+            entry = await self.catalog_service.add_entry(
+                db, job.backup_file, job.backup_format, table_rows, duration_seconds
+            )
+        job.catalog_id = entry.id
+
+    async def _store_backup(self, job: BackupJob) -> None:
+        try:
+            manifest = await asyncio.to_thread(backup_store.add_snapshot, job.backup_file, job.started_at)
+        finally:
+            self.backup_service.remove_backup(job.backup_file)
+        job.snapshot = manifest["name"]
+        job.backup_file = None
+
+        await asyncio.to_thread(backup_store.apply_retention)
+
+    async def _restore_snapshot(self, job: BackupJob) -> None:
+        backup_path = os.path.join(backup_store.staging_dir, f"restore_{job.id}")
+        try:
+            job.backup_file = await asyncio.to_thread(backup_store.materialize, job.snapshot, backup_path)
+            job.tables_total = await self.backup_service.count_backup_tables(job.backup_file)
+            await self.backup_service.restore_backup(job.backup_file, job.jobs, job.track_progress)
+        finally:
+            shutil.rmtree(backup_path, ignore_errors=True)
+            job.backup_file = None
+
+    async def shutdown(self) -> None:
+        """
+        Останавливает очередь и завершает запущенный процесс
+        """
+        for job in self._jobs.values():
+            if job.status == "queued":
+                job.finish("cancelled")
+
+        running = [job._task for job in self._jobs.values() if job._task is not None and not job._task.done()]
+        for task in running:
+            task.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            running.append(self._worker)
+        if running:
+            await asyncio.wait(running)
+
+        self._queue = None
+        self._worker = None
+
+
+# Очередь задач резервного копирования процесса
+backup_jobs = BackupJobManager()
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import traceback
+
+from datetime import datetime, timedelta
+from typing import Optional, Set
+
+from services.backup_jobs import backup_jobs, BackupJob
+from config import BACKUP_SCHEDULE, BACKUP_SCHEDULE_JOBS
+
+
+CRON_MACROS = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# Допустимые значения полей: минута, час, день месяца, месяц, день недели (0 - воскресенье)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class CronSchedule:
+    """
+    Расписание в формате cron из пяти полей: "*", "*/n", "a-b", "a-b/n"
+    и списки через запятую, а также @hourly, @daily, @weekly, @monthly.
+    Как в cron, если заданы и день месяца, и день недели, подходит любой из них
+    """
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = CRON_MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = low, high
+            elif "-" in value_range:
+                start, end = (int(value) for value in value_range.split("-", 1))
+            else:
+                start = end = int(value_range)
+
+            if not (low <= start <= end <= high) or (step and int(step) < 1):
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # isoweekday: понедельник - 1, воскресенье - 7 (в cron 0)
+        weekday = moment.isoweekday() % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Ближайшее время запуска строго после moment (с точностью до минуты)
+
+        :raises ValueError: Если за пять лет подходящего времени нет (например, 31 февраля).
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=5 * 366)
+
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class BackupScheduler:
+    """
+    Планировщик резервных копий внутри процесса приложения.
+
+    По расписанию ставит в очередь backup_jobs дамп в формате directory,
+    который переносится в хранилище с дедупликацией и чисткой по политике
+    хранения. Если предыдущая копия ещё не готова, запуск пропускается.
+    Расписание стоит включать только в одном экземпляре приложения.
+    """
+    def __init__(self, expression: str = BACKUP_SCHEDULE, jobs: int = BACKUP_SCHEDULE_JOBS):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+        self.schedule = CronSchedule(expression) if expression else None
+        self.jobs = jobs
+        self.last_job: Optional[BackupJob] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.schedule is None:
+            self.logger.info("(Backup scheduler) Schedule is not set, scheduler disabled")
+            return
+
+        self._task = asyncio.create_task(self._run())
+        self.logger.info(f"(Backup scheduler) Started with schedule {self.schedule.expression!r}")
+
+    def run_once(self) -> Optional[BackupJob]:
+        """
+        Ставит копию в очередь. Возвращает None, если предыдущая ещё не завершена
+        """
+        if self.last_job is not None and self.last_job.active:
+            self.logger.warning(f"(Backup scheduler) Job {self.last_job.id} is still {self.last_job.status}, run skipped")
+            return None
+
+        self.last_job = backup_jobs.submit_backup("directory", self.jobs, to_store=True)
+        return self.last_job
+
+    async def _run(self) -> None:
+        previous_run = datetime.now()
+        while True:
+            # Не раньше предыдущего запуска: sleep может проснуться чуть раньше срока
+            now = max(datetime.now(), previous_run)
+            next_run = self.schedule.next_after(now)
+            self.logger.info(f"(Backup scheduler) Next backup at {next_run}")
+            await asyncio.sleep((next_run - datetime.now()).total_seconds())
+            previous_run = next_run
+
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"(Backup scheduler) Error: {e}")
+                self.logger.error(traceback.format_exc())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+
+
+# Планировщик копий процесса (BACKUP_SCHEDULE)
+backup_scheduler = BackupScheduler()
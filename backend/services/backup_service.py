@@ -1,61 +1,366 @@
 import os
+import time
+import shutil
+import hashlib
 import logging
 import asyncio
 import traceback
 
+from collections import deque
 from datetime import datetime
-from config import DB_NAME, DB_HOST, DB_PASS, DB_PORT, DB_USER
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.tables.backup import BackupCatalog
+from config import DB_NAME, DB_HOST, DB_PASS, DB_PORT, DB_USER, BACKUP_DIR, BACKUP_STREAM_CHUNK_SIZE
+
+
+class BackupError(Exception):
+    """
+    pg_dump или pg_restore завершились с ошибкой
+    """
+    pass
+
+
+class BackupChecksumError(Exception):
+    """
+    Контрольная сумма резервной копии не совпадает с каталогом
+    """
+    pass
+
+
+def backup_checksum(backup_path: str, chunk_size: int = BACKUP_STREAM_CHUNK_SIZE) -> Tuple[int, str]:
+    """
+    Размер и SHA-256 резервной копии, файл читается по частям.
+    Для каталога (формат directory) в хэш по порядку входят имена и содержимое файлов.
+    Функция блокирующая, из async-кода вызывается через asyncio.to_thread
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+
+    if os.path.isdir(backup_path):
+        paths = [(name, os.path.join(backup_path, name)) for name in sorted(os.listdir(backup_path))]
+    else:
+        paths = [(None, backup_path)]
+
+    for name, path in paths:
+        if name is not None:
+            sha256.update(name.encode() + b"\0")
+        with open(path, "rb") as backup_file:
+            while chunk := backup_file.read(chunk_size):
+                sha256.update(chunk)
+                size += len(chunk)
+
+    return size, sha256.hexdigest()
+
+
+async def terminate_process(process: asyncio.subprocess.Process, stderr_task: "asyncio.Task") -> None:
+    """
+    Завершает процесс, если он ещё работает. Pipe дочитываются до EOF:
+    пока они открыты, asyncio не считает процесс завершённым и wait() не возвращается
+    """
+    if process.returncode is None:
+        process.kill()
+
+    if process.stdout is not None:
+        while await process.stdout.read(BACKUP_STREAM_CHUNK_SIZE):
+            pass
+    if not stderr_task.done():
+        await asyncio.wait([stderr_task])
+
+    await process.wait()
+
+
+class BackupStream:
+    """
+    Вывод pg_dump (или tar с каталогом дампа), отдаваемый клиенту
+    по частям (StreamingResponse).
+
+    Следующая часть читается из pipe только после отправки предыдущей:
+    при медленном клиенте процесс блокируется на записи, память не растёт.
+    Если задан backup_file, поток дублируется на диск (сначала в .part,
+    после успешного завершения файл переименовывается).
+    close() нужно вызвать после ответа (BackgroundTask): он завершает
+    pg_dump, если клиент отключился раньше времени.
+    """
+    def __init__(self,
+                 process: asyncio.subprocess.Process,
+                 stderr_task: "asyncio.Task[Deque[str]]",
+                 logger: logging.Logger,
+                 backup_file: Optional[str] = None,
+                 chunk_size: int = BACKUP_STREAM_CHUNK_SIZE):
+        self.process = process
+        self.stderr_task = stderr_task
+        self.logger = logger
+        self.backup_file = backup_file
+        self.chunk_size = chunk_size
+        self.completed = False
+        # Размер и SHA-256 считаются по ходу передачи, без повторного чтения файла
+        self.size = 0
+        self.duration_seconds: Optional[float] = None
+
+        self._hash = hashlib.sha256()
+        self._started = time.monotonic()
+        self._part_file = f"{backup_file}.part" if backup_file else None
+        self._file = open(self._part_file, "wb") if self._part_file else None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iter_chunks()
+
+    async def _iter_chunks(self) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await self.process.stdout.read(self.chunk_size)
+                if not chunk:
+                    break
+                if self._file:
+                    await asyncio.to_thread(self._file.write, chunk)
+                self.size += len(chunk)
+                self._hash.update(chunk)
+                yield chunk
+
+            returncode = await self.process.wait()
+            stderr_tail = await self.stderr_task
+            if returncode != 0:
+                raise BackupError("\n".join(stderr_tail))
+
+            if self._file:
+                self._file.close()
+                os.replace(self._part_file, self.backup_file)
+
+            self.completed = True
+            self.duration_seconds = time.monotonic() - self._started
+            self.logger.info(f"(Backup stream) Backup stream finished{f': {self.backup_file}' if self.backup_file else ''}")
+
+        except Exception as e:
+            self.logger.error(f"(Backup stream) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+        finally:
+            # Ошибка pg_dump, записи на диск или обрыв передачи
+            if not self.completed:
+                self._discard_part()
+
+    def _discard_part(self) -> None:
+        """
+        Закрывает и удаляет недописанный .part
+        """
+        if self._file and not self._file.closed:
+            self._file.close()
+
+        if self._part_file and os.path.exists(self._part_file):
+            os.remove(self._part_file)
+
+    async def close(self) -> None:
+        if self.process.returncode is None:
+            self.logger.warning("(Backup stream) Client disconnected, process terminated")
+        await terminate_process(self.process, self.stderr_task)
+
+        if not self.completed:
+            self._discard_part()
+
+
+BACKUP_FORMAT_FLAGS = {
+    "custom": "c",
+    "directory": "d",
+}
+
 
 class BackupService:
+    # Версия pg_dump не меняется за время работы процесса
+    _pg_dump_version: Optional[str] = None
+
     def __init__(self):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
-    async def create_backup(self, backup_dir: str = "backups") -> str:
+    @staticmethod
+    def _get_env() -> dict:
+        env = os.environ.copy()
+        env["PGPASSWORD"] = DB_PASS
+        return env
+
+    @staticmethod
+    def backup_filename(backup_format: str = "custom") -> str:
         """
-        Создает резервную копию базы данных PostgreSQL.
-        Возвращает путь к файлу резервной копии.
+        Имя файла (custom) или каталога (directory) резервной копии
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if backup_format == "directory":
+            return f"{DB_NAME}_backup_{timestamp}"
+        return f"{DB_NAME}_backup_{timestamp}.dump"
+
+    @staticmethod
+    def check_jobs(jobs: int, backup_format: Optional[str] = None) -> None:
+        """
+        :raises ValueError: Если число потоков не положительное или параллельный
+            дамп запрошен не в формате каталога.
         """
+        if jobs < 1:
+            raise ValueError("Jobs count must be positive")
+        if backup_format is not None and jobs > 1 and backup_format != "directory":
+            raise ValueError("Parallel dump (jobs > 1) requires directory format")
+
+    @staticmethod
+    def remove_backup(backup_path: str) -> None:
+        """
+        Удаляет файл или каталог резервной копии, если он существует
+        """
+        if os.path.isdir(backup_path):
+            shutil.rmtree(backup_path, ignore_errors=True)
+        elif os.path.exists(backup_path):
+            os.remove(backup_path)
+
+    @classmethod
+    def _dump_command(cls, backup_format: str = "custom", jobs: int = 1, output: Optional[str] = None) -> List[str]:
+        cls.check_jobs(jobs, backup_format)
+
+        command = [
+            "pg_dump",
+            "-U", DB_USER,
+            "-h", DB_HOST,
+            "-p", str(DB_PORT),
+            "-F", BACKUP_FORMAT_FLAGS[backup_format],
+            "-b",
+            "-v",
+            # Каталог копий не восстанавливается вместе с копией
+            # (последовательность serial-ключа исключается отдельно)
+            "--exclude-table", f"public.{BackupCatalog.__tablename__}",
+            "--exclude-table", f"public.{BackupCatalog.__tablename__}_id_seq",
+        ]
+        if jobs > 1:
+            command += ["-j", str(jobs)]
+        if output:
+            command += ["-f", output]
+        return command + [DB_NAME]
+
+    async def _drain_stderr(self,
+                            process: asyncio.subprocess.Process,
+                            operation: str,
+                            on_line: Optional[Callable[[str], None]] = None) -> Deque[str]:
+        """
+        Читает подробный вывод (-v) построчно, не накапливая его в памяти.
+        Каждая строка передаётся в on_line (разбор прогресса).
+        Возвращает последние строки для сообщения об ошибке
+        """
+        tail = deque(maxlen=20)
+        async for line in process.stderr:
+            text = line.decode(errors="replace").rstrip()
+            tail.append(text)
+            self.logger.debug(f"({operation}) {text}")
+            if on_line:
+                on_line(text)
+        return tail
+
+    async def _run(self, command: List[str], operation: str, on_line: Optional[Callable[[str], None]] = None) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            env=self._get_env(),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        stderr_task = asyncio.create_task(self._drain_stderr(process, operation, on_line))
         try:
-            db_host = DB_HOST
-            db_port = str(DB_PORT)  
-            db_name = DB_NAME
-            db_user = DB_USER
-            db_pass = DB_PASS
+            returncode = await process.wait()
+            stderr_tail = await stderr_task
+        finally:
+            await terminate_process(process, stderr_task)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = os.path.join(backup_dir, f"{db_name}_backup_{timestamp}.dump")
+        if returncode != 0:
+            raise BackupError("\n".join(stderr_tail))
 
-            os.makedirs(backup_dir, exist_ok=True)
+    async def get_table_rows(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Таблицы, данные которых попадут в дамп, и число строк в них
+        по статистике PostgreSQL (без полного сканирования таблиц)
+        """
+        try:
+            result = await db.execute(text(
+                "SELECT n.nspname || '.' || c.relname, pg_stat_get_live_tuples(c.oid) "
+                "FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE c.relkind = 'r' "
+                "AND n.nspname NOT IN ('pg_catalog', 'information_schema') "
+                "AND n.nspname NOT LIKE 'pg_toast%' "
+                "AND NOT (n.nspname = 'public' AND c.relname = :catalog) "
+                "ORDER BY 1"
+            ), {"catalog": BackupCatalog.__tablename__})
+            return {name: rows for name, rows in result.all()}
 
-            command = [
-                "pg_dump",
-                "-U", db_user,
-                "-h", db_host,
-                "-p", db_port,
-                "-F", "c",
-                "-b",
-                "-v",
-                "-f", backup_file,
-                db_name
-            ]
+        except Exception as e:
+            self.logger.error(f"(Get table rows) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
 
-            env = os.environ.copy()
-            env["PGPASSWORD"] = db_pass
+    async def get_pg_dump_version(self) -> Optional[str]:
+        if BackupService._pg_dump_version is None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "pg_dump", "--version",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await process.communicate()
+                # "pg_dump (PostgreSQL) 16.2"
+                BackupService._pg_dump_version = stdout.decode(errors="replace").strip().split()[-1]
+            except Exception as e:
+                self.logger.warning(f"(Get pg_dump version) Error: {e}")
+        return BackupService._pg_dump_version
 
+    async def count_backup_tables(self, backup_file: str) -> int:
+        """
+        Число таблиц с данными в резервной копии (по оглавлению pg_restore -l)
+        """
+        try:
             process = await asyncio.create_subprocess_exec(
-                *command,
-                env=env,
+                "pg_restore", "--list", backup_file,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-
             stdout, stderr = await process.communicate()
-
             if process.returncode != 0:
-                error_message = stderr.decode().strip()
-                self.logger.warning(f"(Backup create) Backup create error: {error_message}")
-                raise Exception
+                raise BackupError(stderr.decode(errors="replace").strip())
+
+            return sum(1 for line in stdout.decode(errors="replace").splitlines()
+                       if not line.startswith(";") and " TABLE DATA " in line)
+
+        except Exception as e:
+            self.logger.error(f"(Count backup tables) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def create_backup(self,
+                            backup_dir: str = BACKUP_DIR,
+                            backup_format: str = "custom",
+                            jobs: int = 1,
+                            on_line: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Создает резервную копию базы данных PostgreSQL.
+        Формат directory позволяет выгружать таблицы в jobs параллельных потоков.
+        Недописанная копия удаляется при ошибке или отмене.
+        Возвращает путь к файлу (или каталогу) резервной копии.
+        """
+        try:
+            backup_file = os.path.join(backup_dir, self.backup_filename(backup_format))
+            command = self._dump_command(backup_format, jobs, backup_file)
+
+            os.makedirs(backup_dir, exist_ok=True)
+
+            completed = False
+            try:
+                await self._run(command, "Backup create", on_line)
+                completed = True
+            finally:
+                if not completed:
+                    self.remove_backup(backup_file)
 
             self.logger.info(f"(Backup create) Backup create successuful: {backup_file}")
             return backup_file
@@ -65,50 +370,92 @@ class BackupService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def restore_backup(self, backup_file: str) -> None:
+    async def open_backup_stream(self, backup_dir: Optional[str] = None, filename: Optional[str] = None) -> BackupStream:
+        """
+        Запускает pg_dump с выводом в stdout и возвращает поток для StreamingResponse.
+        Если указан backup_dir, копия одновременно сохраняется в файл.
+        """
+        try:
+            backup_file = None
+            if backup_dir:
+                os.makedirs(backup_dir, exist_ok=True)
+                backup_file = os.path.join(backup_dir, filename or self.backup_filename())
+
+            process = await asyncio.create_subprocess_exec(
+                *self._dump_command("custom"),
+                env=self._get_env(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stderr_task = asyncio.create_task(self._drain_stderr(process, "Backup stream"))
+
+            try:
+                stream = BackupStream(process, stderr_task, self.logger, backup_file)
+            except Exception:
+                await terminate_process(process, stderr_task)
+                raise
+
+            self.logger.info(f"(Backup stream) pg_dump started with pid {process.pid}")
+            return stream
+
+        except Exception as e:
+            self.logger.error(f"(Backup stream) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def open_tar_stream(self, backup_path: str) -> BackupStream:
+        """
+        Упаковывает каталог резервной копии в tar на лету и возвращает поток
+        для StreamingResponse (без промежуточного архива на диске)
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "tar", "-cf", "-",
+                "-C", os.path.dirname(os.path.abspath(backup_path)),
+                os.path.basename(backup_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stderr_task = asyncio.create_task(self._drain_stderr(process, "Backup tar stream"))
+
+            self.logger.info(f"(Backup tar stream) tar started for {backup_path}")
+            return BackupStream(process, stderr_task, self.logger)
+
+        except Exception as e:
+            self.logger.error(f"(Backup tar stream) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def restore_backup(self,
+                             backup_file: str,
+                             jobs: int = 1,
+                             on_line: Optional[Callable[[str], None]] = None) -> None:
         """
-        Восстанавливает базу данных PostgreSQL из резервной копии.
+        Восстанавливает базу данных PostgreSQL из резервной копии
+        (файла custom или каталога directory), jobs - число параллельных потоков.
         """
         try:
-            db_host = DB_HOST
-            db_port = str(DB_PORT)
-            db_name = DB_NAME
-            db_user = DB_USER
-            db_pass = DB_PASS
+            self.check_jobs(jobs)
 
             command = [
                 "pg_restore",
                 "--clean",
                 "--if-exists",
-                "--dbname", db_name,
-                "--host", db_host,
-                "--port", db_port,
-                "--username", db_user,
+                "--dbname", DB_NAME,
+                "--host", DB_HOST,
+                "--port", str(DB_PORT),
+                "--username", DB_USER,
                 "--no-password",
                 "--verbose",
+                "--jobs", str(jobs),
                 backup_file
             ]
 
-            env = os.environ.copy()
-            env["PGPASSWORD"] = db_pass
-
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_message = stderr.decode().strip()
-                self.logger.warning(f"(Backup restore) Error backup restore: {error_message}")
-                raise Exception
+            await self._run(command, "Backup restore", on_line)
 
             self.logger.info(f"(Backup restore) Backup restore successful: {backup_file}")
 
         except Exception as e:
             self.logger.error(f"(Backup restore) Error: {e}")
             self.logger.error(traceback.format_exc())
-            raise
\ No newline at end of file
+            raise
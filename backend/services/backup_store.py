@@ -0,0 +1,227 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.backup_service import BackupChecksumError
+from config import (
+    BACKUP_STORE_DIR, BACKUP_CHUNK_SIZE,
+    BACKUP_KEEP_LAST, BACKUP_KEEP_DAILY, BACKUP_KEEP_WEEKLY, BACKUP_KEEP_MONTHLY
+)
+
+
+def gfs_retained(snapshots: Iterable[Tuple[str, datetime]],
+                 last: int = BACKUP_KEEP_LAST,
+                 daily: int = BACKUP_KEEP_DAILY,
+                 weekly: int = BACKUP_KEEP_WEEKLY,
+                 monthly: int = BACKUP_KEEP_MONTHLY) -> Set[str]:
+    """
+    Политика grandfather-father-son: last последних копий, а также самая
+    новая копия за каждый из daily дней, weekly недель и monthly месяцев.
+    Возвращает имена копий, которые нужно оставить
+    """
+    ordered = sorted(snapshots, key=lambda snapshot: snapshot[1], reverse=True)
+    retained = {name for name, _ in ordered[:last]}
+
+    periods = (
+        (daily, lambda created_at: created_at.date()),
+        (weekly, lambda created_at: created_at.isocalendar()[:2]),
+        (monthly, lambda created_at: (created_at.year, created_at.month)),
+    )
+    for keep, period_of in periods:
+        seen = set()
+        for name, created_at in ordered:
+            if len(seen) >= keep:
+                break
+            period = period_of(created_at)
+            if period not in seen:
+                seen.add(period)
+                retained.add(name)
+
+    return retained
+
+
+class BackupStore:
+    """
+    Хранилище резервных копий с дедупликацией.
+
+    Копия в формате directory разбивается на блоки по BACKUP_CHUNK_SIZE,
+    каждый блок хранится один раз под своим SHA-256 (chunks/ab/abcd...).
+    Файлы данных неизменившихся таблиц у pg_dump получаются побайтно
+    одинаковыми, поэтому между копиями они не дублируются.
+    Копия описывается манифестом snapshots/<name>.json со списком блоков
+    каждого файла. Методы блокирующие, из async-кода их вызывают через
+    asyncio.to_thread.
+    """
+    def __init__(self, root: str = BACKUP_STORE_DIR, chunk_size: int = BACKUP_CHUNK_SIZE):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+        self.root = root
+        self.chunk_size = chunk_size
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.staging_dir = os.path.join(root, "staging")
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def _manifest_path(self, name: str) -> str:
+        if os.path.basename(name) != name or name.startswith("."):
+            raise ValueError(f"Invalid snapshot name: {name}")
+        return os.path.join(self.snapshots_dir, f"{name}.json")
+
+    def _store_chunk(self, chunk: bytes) -> Tuple[str, bool]:
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as chunk_file:
+            chunk_file.write(chunk)
+        os.replace(f"{path}.tmp", path)
+        return digest, True
+
+    def add_snapshot(self, backup_path: str, created_at: Optional[datetime] = None) -> Dict:
+        """
+        Переносит каталог резервной копии в хранилище и удаляет исходный каталог.
+        Возвращает манифест копии
+        """
+        name = os.path.basename(os.path.normpath(backup_path))
+        manifest_path = self._manifest_path(name)
+
+        files = {}
+        size = 0
+        stored_size = 0
+        for filename in sorted(os.listdir(backup_path)):
+            chunks = []
+            with open(os.path.join(backup_path, filename), "rb") as backup_file:
+                while chunk := backup_file.read(self.chunk_size):
+                    digest, stored = self._store_chunk(chunk)
+                    chunks.append(digest)
+                    size += len(chunk)
+                    if stored:
+                        stored_size += len(chunk)
+            files[filename] = chunks
+
+        manifest = {
+            "name": name,
+            "created_at": (created_at or datetime.now()).isoformat(),
+            "size": size,
+            "stored_size": stored_size,
+            "files": files,
+        }
+
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        with open(f"{manifest_path}.tmp", "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+        shutil.rmtree(backup_path, ignore_errors=True)
+
+        self.logger.info(f"(Backup store) Snapshot {name} added: {size} bytes, {stored_size} new")
+        return manifest
+
+    def get_snapshot(self, name: str) -> Optional[Dict]:
+        try:
+            with open(self._manifest_path(name)) as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return None
+
+    def get_snapshots(self) -> List[Dict]:
+        """
+        Манифесты всех копий, новые первыми
+        """
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+
+        snapshots = []
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith(".json"):
+                snapshot = self.get_snapshot(filename[:-len(".json")])
+                if snapshot:
+                    snapshots.append(snapshot)
+        return sorted(snapshots, key=lambda snapshot: snapshot["created_at"], reverse=True)
+
+    def materialize(self, name: str, target_dir: str) -> str:
+        """
+        Собирает каталог резервной копии из блоков (для pg_restore).
+        Каждый блок сверяется со своим SHA-256 по ходу копирования.
+
+        :raises ValueError: Если копия не найдена.
+        :raises BackupChecksumError: Если блок повреждён.
+        """
+        snapshot = self.get_snapshot(name)
+        if snapshot is None:
+            raise ValueError(f"Snapshot not found: {name}")
+
+        backup_path = os.path.join(target_dir, name)
+        os.makedirs(backup_path, exist_ok=True)
+        for filename, chunks in snapshot["files"].items():
+            with open(os.path.join(backup_path, filename), "wb") as backup_file:
+                for digest in chunks:
+                    with open(self._chunk_path(digest), "rb") as chunk_file:
+                        chunk = chunk_file.read()
+                    if hashlib.sha256(chunk).hexdigest() != digest:
+                        raise BackupChecksumError(f"Snapshot {name} chunk {digest} is corrupted")
+                    backup_file.write(chunk)
+        return backup_path
+
+    def delete_snapshot(self, name: str) -> bool:
+        try:
+            os.remove(self._manifest_path(name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def collect_garbage(self) -> int:
+        """
+        Удаляет блоки, на которые не ссылается ни одна копия.
+        Возвращает число удалённых блоков
+        """
+        referenced = {
+            digest
+            for snapshot in self.get_snapshots()
+            for chunks in snapshot["files"].values()
+            for digest in chunks
+        }
+
+        removed = 0
+        if not os.path.isdir(self.chunks_dir):
+            return removed
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+                    removed += 1
+        return removed
+
+    def apply_retention(self) -> List[str]:
+        """
+        Удаляет копии, не попавшие под политику хранения, и их блоки.
+        Возвращает имена удалённых копий
+        """
+        snapshots = self.get_snapshots()
+        retained = gfs_retained(
+            (snapshot["name"], datetime.fromisoformat(snapshot["created_at"])) for snapshot in snapshots
+        )
+
+        removed = [snapshot["name"] for snapshot in snapshots if snapshot["name"] not in retained]
+        for name in removed:
+            self.delete_snapshot(name)
+
+        chunks_removed = self.collect_garbage() if removed else 0
+        if removed:
+            self.logger.info(f"(Backup store) Retention removed {len(removed)} snapshots, {chunks_removed} chunks")
+        return removed
+
+
+# Хранилище копий, создаваемых по расписанию
+backup_store = BackupStore()
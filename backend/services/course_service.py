@@ -3,12 +3,14 @@ import traceback
 
 from typing import List, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, or_
+from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.pagination import apply_cursor
 from models.tables.course import Course
 from models.tables.task import Task
+from services.response_cache import active_courses_cache
 
 class CourseService:
     def __init__(self):
@@ -37,12 +39,16 @@ class CourseService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def get_courses(self, db: AsyncSession, skip: int = 0, limit: int = 25) -> List[Course]:
+    async def get_courses(self, db: AsyncSession, skip: int = 0, limit: int = 25, cursor: Optional[str] = None) -> List[Course]:
         try:
+            query = apply_cursor(select(Course), cursor, Course.id)
+            if not cursor:
+                query = query.offset(skip)
+
             courses = (
                 await db.execute(
-                    select(Course)
-                    .offset(skip)
+                    query
+                    .options(joinedload(Course.stats))
                     .limit(limit)
                     )
                 ).scalars().all()
@@ -54,39 +60,61 @@ class CourseService:
             self.logger.error(traceback.format_exc())
             raise
     
-    async def get_active_courses(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[Course]:
+    async def get_active_courses(self, db: AsyncSession, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[Course]:
+        """
+        Публичный каталог: только активные курсы в порядке id,
+        условие и сортировка совпадают с частичным индексом ix_course_active_id
+        """
         try:
+            query = apply_cursor(
+                select(Course).where(Course.status == "active"),
+                cursor,
+                Course.id
+            )
+            if not cursor:
+                query = query.offset(skip)
+
             courses = (
                 await db.execute(
-                    select(Course)
-                    .where(Course.status != "deleted" or Course.status != "closed")
-                    .offset(skip)
+                    query
+                    .options(joinedload(Course.stats))
                     .limit(limit)
                     )
                 ).scalars().all()
-            self.logger.info(f"(Get not deleted courses) Retrieved {len(courses)} courses")
+            self.logger.info(f"(Get active courses) Retrieved {len(courses)} courses")
             return courses
         
         except Exception as e:
-            self.logger.error(f"(Get not deleted courses) Error: {e}")
+            self.logger.error(f"(Get active courses) Error: {e}")
             self.logger.error(traceback.format_exc())
             raise
 
-    # Функция для получения полного списка курсов с его задачами
-    async def get_courses_with_tasks(self, db: AsyncSession, skip: int = 0, limit: int = 5) -> List[Course]:
+    # Функция для получения полного списка курсов с его задачами.
+    # Страница курсов и все их задачи загружаются двумя запросами
+    # (курсы + selectinload задач по списку id) независимо от размера страницы
+    async def get_courses_with_tasks(self,
+                                     db: AsyncSession,
+                                     skip: int = 0,
+                                     limit: int = 5,
+                                     cursor: Optional[str] = None,
+                                     task_statuses: Optional[List[str]] = None) -> List[Course]:
         try:
+            if task_statuses:
+                tasks_filter = Task.status.in_(task_statuses)
+            else:
+                tasks_filter = Task.status != "deleted"
+
+            query = apply_cursor(select(Course), cursor, Course.id)
+            if not cursor:
+                query = query.offset(skip)
+
             courses = (
                 await db.execute(
-                    select(Course)
-                    .options(selectinload(Course.tasks))
-                    .offset(skip)
+                    query
+                    .options(selectinload(Course.tasks.and_(tasks_filter)))
                     .limit(limit)
                     )
                 ).scalars().all()
-            
-            for course in courses:
-                if not course.tasks:
-                    course.tasks = (await db.scalars(select(Task).where(Task.course_id == course.id))).all()
 
             self.logger.info(f"(Get courses with tasks) Retrieved {len(courses)} courses")
             return courses
@@ -99,8 +127,7 @@ class CourseService:
     async def create_course(self,
                             db: AsyncSession, 
                             name: str,
-                            description: str,
-                            students_count: int
+                            description: str
                             ) -> Course:
         try:
             existing_course = (await db.scalars(select(Course).where(Course.name == name))).first()
@@ -109,12 +136,12 @@ class CourseService:
 
             course = Course(
                 name = name,
-                description = description,
-                students_count = students_count
+                description = description
             )
             
             db.add(course)
             await db.commit()
+            active_courses_cache.clear()
             await db.refresh(course)
 
             self.logger.info(f"(Create course) Course with ID {course.id} was successfully created: {course.name}")
@@ -131,36 +158,33 @@ class CourseService:
                             course_id: int, 
                             course_name: str,
                             course_description: str,
-                            course_students_count: int,
                             course_status: str) -> Optional[Course]:
         try:
-            course = (await db.scalars(select(Course).where(Course.id == course_id))).first()
-
-            if not course:
-                self.logger.warning(f"(Update course) Course with id {course_id} not found")
-                return None
-            
             updates = {
                 "name" : course_name,
                 "description": course_description,
-                "students_count": course_students_count,
                 "status": course_status 
             }
 
-            has_changes = any(
-                getattr(course, key) != value for key, value in updates.items()
-            )
+            # Отсутствие изменений проверяется в самом UPDATE: строка без
+            # изменений не попадает под WHERE и не возвращается
+            course = (
+                await db.scalars(
+                    update(Course)
+                    .where(Course.id == course_id)
+                    .where(or_(*[getattr(Course, key).is_distinct_from(value) for key, value in updates.items()]))
+                    .values(**updates)
+                    .returning(Course)
+                    )
+                ).first()
 
-            if has_changes:
-                for key, value in updates.items():
-                    setattr(course, key, value)
-                
-                await db.commit()
-                await db.refresh(course)
-                self.logger.info(f"(Update course) Course with ID {course_id} was update successfully")
-            else:
-                self.logger.warning(f"(Update course) No updates for course with id {course_id}")
+            if not course:
+                self.logger.warning(f"(Update course) Course with id {course_id} not found or has no updates")
                 return None
+
+            await db.commit()
+            active_courses_cache.clear()
+            self.logger.info(f"(Update course) Course with ID {course_id} was update successfully")
             return course
 
         except Exception as e:
@@ -171,21 +195,23 @@ class CourseService:
 
     async def delete_status_course(self, db: AsyncSession, course_id: int) -> Optional[Course]:
         try:
-            course = (await db.scalars(select(Course).where(Course.id == course_id))).first()
+            course = (
+                await db.scalars(
+                    update(Course)
+                    .where(Course.id == course_id)
+                    .where(Course.status.is_distinct_from("deleted"))
+                    .values(status="deleted")
+                    .returning(Course)
+                    )
+                ).first()
 
             if not course:
-                self.logger.warning(f"(Delete status course) Course with id {course_id} not found")
+                self.logger.warning(f"(Delete status course) Course with id {course_id} not found or was already delete")
                 return None
-            
-            if course.status != "deleted":
-                course.status = "deleted"
-                await db.commit()
-                await db.refresh(course)
-                self.logger.info(f"(Delete status course) course with id {course_id} deleted successfully")
-            else:
-                self.logger.warning(f"(Delete status course) Course with id {course_id} was already delete")
-                return None
-            
+
+            await db.commit()
+            active_courses_cache.clear()
+            self.logger.info(f"(Delete status course) course with id {course_id} deleted successfully")
             return course
 
         except Exception as e:
@@ -204,6 +230,7 @@ class CourseService:
 
             await db.delete(course)
             await db.commit()
+            active_courses_cache.clear()
 
             self.logger.info(f"(Delete course) Course with id {course_id} was successfully deleted")
             return course
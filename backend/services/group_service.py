@@ -4,21 +4,31 @@ import traceback
 
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.user_service import UserService
 
+from db.pagination import apply_cursor
 from models.tables.group import Group
 from models.tables.user import User
 from models.tables.course import Course
 from models.tables.task import Task
 from models.tables.journal import Journal
 
-from models.schemas.group_schemas import GroupCourseWithStudentsSchema, GroupSchema
+from models.schemas.group_schemas import GroupCourseWithStudentsSchema, GroupSchema, GroupBulkResultSchema, GroupEnrollmentStatus
 from models.schemas.user_schemas import UserProfileSchema
 
 class GroupService:
+    """
+    Зачисление студентов на курсы.
+
+    course.students_count пересчитывают триггеры на "group" (миграция
+    e49098b7d1b7) в той же транзакции, что и вставка или удаление записей,
+    поэтому одиночные и массовые методы добавления и удаления его не трогают,
+    а при чтении курса значение уже актуально
+    """
     def __init__(self):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -68,6 +78,75 @@ class GroupService:
             await db.rollback()
             raise
 
+    async def add_students_to_course(self, db: AsyncSession, course_id: int, user_ids: List[uuid.UUID]) -> Optional[List[GroupBulkResultSchema]]:
+        """
+        Массовое зачисление студентов на курс.
+        Роли проверяются одним запросом, существующие записи пропускаются
+        через ON CONFLICT DO NOTHING, журнал заполняется одним INSERT ... SELECT
+        """
+        try:
+            course_exists = (await db.execute(select(Course.id).where(Course.id == course_id))).scalar_one_or_none()
+            if course_exists is None:
+                self.logger.warning(f"(Add students to course) Course {course_id} not found")
+                return None
+
+            user_ids = list(dict.fromkeys(user_ids))
+            if not user_ids:
+                return []
+
+            roles = dict(
+                (await db.execute(
+                    select(User.id, User.role)
+                    .where(User.id.in_(user_ids))
+                )).all()
+            )
+            student_ids = [user_id for user_id in user_ids if roles.get(user_id) == "student"]
+
+            added_ids = set()
+            if student_ids:
+                added_ids = set(
+                    (await db.execute(
+                        pg_insert(Group)
+                        .values([{"course_id": course_id, "user_id": user_id} for user_id in student_ids])
+                        .on_conflict_do_nothing(index_elements=[Group.user_id, Group.course_id])
+                        .returning(Group.user_id)
+                    )).scalars().all()
+                )
+
+            if added_ids:
+                await db.execute(
+                    insert(Journal).from_select(
+                        ["user_id", "task_id", "mark", "comment"],
+                        select(Group.user_id, Task.id, literal(0), literal(""))
+                        .join(Task, Task.course_id == Group.course_id)
+                        .where(Group.course_id == course_id)
+                        .where(Group.user_id.in_(list(added_ids)))
+                    )
+                )
+
+            await db.commit()
+
+            results = []
+            for user_id in user_ids:
+                if user_id not in roles:
+                    status = GroupEnrollmentStatus.NOT_FOUND
+                elif roles[user_id] != "student":
+                    status = GroupEnrollmentStatus.NOT_STUDENT
+                elif user_id in added_ids:
+                    status = GroupEnrollmentStatus.ADDED
+                else:
+                    status = GroupEnrollmentStatus.ALREADY_IN_COURSE
+                results.append(GroupBulkResultSchema(user_id=user_id, status=status))
+
+            self.logger.info(f"(Add students to course) Added {len(added_ids)} of {len(user_ids)} students to course {course_id}")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"(Add students to course) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            await db.rollback()
+            raise
+
     async def remove_student_from_course(self, db: AsyncSession, course_id: int, user_id: str) -> Optional[Group]:
         try:
             existing_record = await db.execute(
@@ -142,15 +221,23 @@ class GroupService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def get_all_groups(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[GroupCourseWithStudentsSchema]:
+    async def get_all_groups(self, db: AsyncSession, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[GroupCourseWithStudentsSchema]:
         try:
+            query = apply_cursor(select(Course), cursor, Course.id)
+            if not cursor:
+                query = query.offset(skip)
+
+            # LIMIT применяется к курсам, а студенты страницы догружаются
+            # одним запросом IN (...), без декартова произведения курс x студент
             result = await db.execute(
-                select(Course)
-                .options(joinedload(Course.users))
-                .offset(skip)
+                query
+                .options(
+                    selectinload(Course.users)
+                    .load_only(User.name, User.email, User.role)
+                )
                 .limit(limit)
             )
-            courses = result.unique().scalars().all()
+            courses = result.scalars().all()
 
             groups = []
             for course in courses:
@@ -0,0 +1,205 @@
+import json
+import logging
+import traceback
+
+from typing import AsyncIterator, List, Tuple
+
+from sqlalchemy import select, update, values, column, cast, or_, func, JSON, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.tables.journal import Journal
+from models.tables.task import Task
+from models.tables.user import User
+
+from models.schemas.journal_schemas import JournalStudentAverageSchema, JournalTaskStatsSchema, JournalMarkSchema, JournalMarkResultSchema
+
+# Ограничение на число параметров запроса asyncpg (32767), по 5 на строку
+MARKS_CHUNK_SIZE = 1000
+
+# Оценка 0 - заглушка для ещё не проверенного задания (при зачислении
+# и создании задания), в статистику попадают только выставленные оценки
+GRADED = Journal.mark > 0
+
+
+class JournalConflictError(Exception):
+    """
+    Часть оценок не записана: записи нет или её версия изменилась
+    """
+    def __init__(self, conflicts: List[Tuple[str, int]]):
+        super().__init__(f"Journal entries changed or not found: {conflicts}")
+        self.conflicts = conflicts
+
+
+class JournalService:
+    def __init__(self):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _course_journal(course_id: int):
+        """
+        Записи журнала по неудалённым заданиям курса
+        """
+        return (
+            select()
+            .select_from(Journal)
+            .join(Task, Task.id == Journal.task_id)
+            .where(Task.course_id == course_id)
+            .where(Task.status != "deleted")
+        )
+
+    async def stream_gradebook(self, db: AsyncSession, course_id: int) -> AsyncIterator[str]:
+        """
+        Ведомость курса: одна строка NDJSON на студента с оценками по всем
+        заданиям. Строится одним запросом с GROUP BY и читается курсором,
+        поэтому память не зависит от размера курса
+        """
+        try:
+            query = (
+                self._course_journal(course_id)
+                .join(User, User.id == Journal.user_id)
+                .add_columns(
+                    User.id,
+                    User.name,
+                    User.email,
+                    func.avg(Journal.mark).filter(GRADED).label("average_mark"),
+                    func.json_object_agg(Task.id, Journal.mark, type_=JSON).label("marks"),
+                )
+                .group_by(User.id)
+                .order_by(User.name, User.id)
+            )
+
+            rows_count = 0
+            result = await db.stream(query)
+            async for row in result:
+                rows_count += 1
+                yield json.dumps({
+                    "user_id": str(row.id),
+                    "name": row.name,
+                    "email": row.email,
+                    "average_mark": float(row.average_mark) if row.average_mark is not None else None,
+                    "marks": row.marks,
+                }, ensure_ascii=False) + "\n"
+
+            self.logger.info(f"(Stream gradebook) Streamed {rows_count} students of course {course_id}")
+
+        except Exception as e:
+            self.logger.error(f"(Stream gradebook) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def get_student_averages(self, db: AsyncSession, course_id: int) -> List[JournalStudentAverageSchema]:
+        try:
+            average_mark = func.avg(Journal.mark).filter(GRADED)
+            rows = (
+                await db.execute(
+                    self._course_journal(course_id)
+                    .join(User, User.id == Journal.user_id)
+                    .add_columns(
+                        User.id.label("user_id"),
+                        User.name,
+                        average_mark.label("average_mark"),
+                        func.count(Journal.task_id).label("tasks_count"),
+                        func.rank().over(order_by=average_mark.desc().nulls_last()).label("rank"),
+                    )
+                    .group_by(User.id)
+                    .order_by("rank", User.name)
+                )
+            ).all()
+
+            self.logger.info(f"(Get student averages) Retrieved {len(rows)} students of course {course_id}")
+            return [JournalStudentAverageSchema.model_validate(row) for row in rows]
+
+        except Exception as e:
+            self.logger.error(f"(Get student averages) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def get_task_stats(self, db: AsyncSession, course_id: int) -> List[JournalTaskStatsSchema]:
+        try:
+            rows = (
+                await db.execute(
+                    self._course_journal(course_id)
+                    .add_columns(
+                        Task.id.label("task_id"),
+                        Task.name,
+                        func.avg(Journal.mark).filter(GRADED).label("average_mark"),
+                        func.min(Journal.mark).filter(GRADED).label("min_mark"),
+                        func.max(Journal.mark).filter(GRADED).label("max_mark"),
+                        func.count().filter(GRADED).label("graded_count"),
+                        func.count(Journal.user_id).label("students_count"),
+                    )
+                    .group_by(Task.id)
+                    .order_by(Task.id)
+                )
+            ).all()
+
+            self.logger.info(f"(Get task stats) Retrieved {len(rows)} tasks of course {course_id}")
+            return [JournalTaskStatsSchema.model_validate(row) for row in rows]
+
+        except Exception as e:
+            self.logger.error(f"(Get task stats) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def submit_marks(self, db: AsyncSession, marks: List[JournalMarkSchema]) -> List[JournalMarkResultSchema]:
+        """
+        Массовое выставление оценок одним UPDATE ... FROM (VALUES ...)
+        в одной транзакции. Если у оценки указана версия, запись обновляется
+        только при совпадении версии; при любом конфликте транзакция
+        откатывается целиком. Оценка без комментария сохраняет прежний комментарий
+        """
+        try:
+            # Повторы одной пары (студент, задание) - побеждает последняя оценка
+            marks = list({(mark.user_id, mark.task_id): mark for mark in marks}.values())
+
+            updated = []
+            for start in range(0, len(marks), MARKS_CHUNK_SIZE):
+                chunk = marks[start:start + MARKS_CHUNK_SIZE]
+                marks_values = values(
+                    column("user_id", UUID(as_uuid=True)),
+                    column("task_id", Integer),
+                    column("mark", Integer),
+                    column("comment", String),
+                    column("version", Integer),
+                    name="marks",
+                ).data([(mark.user_id, mark.task_id, mark.mark, mark.comment, mark.version) for mark in chunk])
+
+                expected_version = cast(marks_values.c.version, Integer)
+                rows = (
+                    await db.execute(
+                        update(Journal)
+                        .where(Journal.user_id == marks_values.c.user_id)
+                        .where(Journal.task_id == marks_values.c.task_id)
+                        .where(or_(expected_version.is_(None), Journal.version == expected_version))
+                        .values(
+                            mark=marks_values.c.mark,
+                            comment=func.coalesce(marks_values.c.comment, Journal.comment),
+                            version=Journal.version + 1,
+                        )
+                        .returning(Journal.user_id, Journal.task_id, Journal.mark, Journal.version)
+                        .execution_options(synchronize_session=False)
+                    )
+                ).all()
+                updated.extend(rows)
+
+            updated_keys = {(row.user_id, row.task_id) for row in updated}
+            conflicts = [(str(mark.user_id), mark.task_id) for mark in marks if (mark.user_id, mark.task_id) not in updated_keys]
+            if conflicts:
+                await db.rollback()
+                self.logger.warning(f"(Submit marks) {len(conflicts)} conflicts, nothing saved")
+                raise JournalConflictError(conflicts)
+
+            await db.commit()
+
+            self.logger.info(f"(Submit marks) Saved {len(updated)} marks")
+            return [JournalMarkResultSchema.model_validate(row) for row in updated]
+
+        except JournalConflictError:
+            raise
+        except Exception as e:
+            self.logger.error(f"(Submit marks) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            await db.rollback()
+            raise
@@ -0,0 +1,56 @@
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from config import ACTIVE_COURSES_CACHE_SECONDS
+
+
+class ResponseCache:
+    """
+    Кэш готовых ответов в памяти процесса.
+
+    Записи живут ttl секунд, при переполнении вытесняются самые старые
+    по обращению. ttl = 0 отключает кэш. Кэш локален для процесса,
+    поэтому другие воркеры увидят изменения не позже чем через ttl.
+    """
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Публичный каталог активных курсов
+active_courses_cache = ResponseCache(ACTIVE_COURSES_CACHE_SECONDS)
@@ -0,0 +1,188 @@
+"""
+Кэш отозванных токенов (таблица crl) для проверки токенов без запроса к базе.
+
+Если токена нет в фильтре Блума, база данных не опрашивается. Поэтому токен,
+отозванный через другой процесс (worker), принимается ещё до
+REVOCATION_SYNC_SECONDS, пока этот процесс не подтянет новые записи crl.
+В процессе, который отозвал токен, отзыв действует сразу.
+"""
+import math
+import time
+import asyncio
+import hashlib
+import logging
+import traceback
+
+from typing import Dict, Optional
+
+from jose import jwt
+from jose import JWTError
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.tables.user import CRL
+from config import REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE, REVOCATION_SYNC_SECONDS
+
+
+class BloomFilter:
+    """
+    Фильтр Блума для отрицательных проверок: если токена нет в фильтре,
+    то его точно нет в таблице crl
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+
+        self.size = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationCache:
+    """
+    Локальный для процесса кэш отозванных токенов.
+
+    Отозванные токены хранятся до истечения их срока действия (exp),
+    поверх них строится фильтр Блума, поэтому неотозванные токены
+    проверяются без обращения к базе данных. Новые записи таблицы crl
+    подтягиваются не чаще одного раза в REVOCATION_SYNC_SECONDS.
+    """
+    def __init__(self,
+                 capacity: int = REVOCATION_BLOOM_CAPACITY,
+                 error_rate: float = REVOCATION_BLOOM_ERROR_RATE,
+                 sync_interval: float = REVOCATION_SYNC_SECONDS):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        self._last_sync = 0.0
+        self._warmed = False
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _get_expire(token: str) -> Optional[float]:
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+            return float(exp) if exp is not None else None
+        except (JWTError, ValueError, TypeError):
+            return None
+
+    def _rebuild(self) -> None:
+        capacity = max(self.capacity, len(self._revoked) * 2)
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        for token in self._revoked:
+            self._bloom.add(token)
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [token for token, exp in self._revoked.items() if exp <= now]
+        for token in expired:
+            del self._revoked[token]
+
+        # Удалять из фильтра Блума нельзя, поэтому он перестраивается,
+        # когда накопленные записи начинают портить точность
+        if expired or self._bloom.count > self._bloom.capacity:
+            self._rebuild()
+
+    def add(self, token: str, crl_id: Optional[int] = None) -> None:
+        """
+        Добавляет токен в кэш. Токены с истёкшим сроком не кэшируются,
+        так как они и так не пройдут проверку подписи.
+        """
+        # Отметка синхронизации сдвигается и для истёкших записей,
+        # иначе sync() перечитывал бы их из crl при каждом запуске
+        if crl_id is not None and crl_id > self._last_id:
+            self._last_id = crl_id
+
+        exp = self._get_expire(token)
+        if exp is None:
+            exp = time.time() + self.sync_interval
+        elif exp <= time.time():
+            return
+
+        if token not in self._revoked:
+            self._bloom.add(token)
+        self._revoked[token] = exp
+
+    async def warm(self, db: AsyncSession) -> None:
+        """
+        Полная загрузка таблицы crl (при старте приложения)
+        """
+        try:
+            async with self._lock:
+                rows = (await db.execute(select(CRL.id, CRL.token))).all()
+
+                self._revoked.clear()
+                self._last_id = 0
+                for crl_id, token in rows:
+                    self.add(token, crl_id)
+                self._rebuild()
+
+                self._last_sync = time.monotonic()
+                self._warmed = True
+            self.logger.info(f"(Revocation cache) Warmed with {len(self._revoked)} active revoked tokens")
+        except Exception as e:
+            self.logger.error(f"(Revocation cache) Error warming cache: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        Подтягивает записи crl, добавленные другими процессами
+        """
+        if not self._warmed:
+            await self.warm(db)
+            return
+
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+
+        async with self._lock:
+            if time.monotonic() - self._last_sync < self.sync_interval:
+                return
+
+            rows = (
+                await db.execute(
+                    select(CRL.id, CRL.token)
+                    .where(CRL.id > self._last_id)
+                    .order_by(CRL.id)
+                )
+            ).all()
+            for crl_id, token in rows:
+                self.add(token, crl_id)
+
+            self._evict_expired()
+            self._last_sync = time.monotonic()
+
+    def is_revoked(self, token: str) -> bool:
+        exp = self._revoked.get(token)
+        return exp is not None and exp > time.time()
+
+    def might_be_revoked(self, token: str) -> bool:
+        return token in self._bloom
+
+
+revocation_cache = RevocationCache()
@@ -3,16 +3,42 @@ import traceback
 
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, literal, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from db.pagination import apply_cursor
 from models.tables.task import Task
 from models.tables.course import Course
+from models.tables.group import Group
+from models.tables.journal import Journal
+
+TASK_STATUSES = Task.__table__.c.status.type.enums
+
+# Разрешённые переходы статуса задания: новый статус -> допустимые текущие
+TASK_STATUS_TRANSITIONS = {
+    "inProcess": ("closed",),
+    "done": ("inProcess",),
+    "deleted": ("closed", "inProcess", "done"),
+}
 
 class TaskService:
     def __init__(self):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+    async def _seed_journal(self, db: AsyncSession, task_ids: List[int]) -> None:
+        """
+        Создаёт записи журнала по новым заданиям для всех уже зачисленных
+        на курс студентов одним INSERT ... SELECT FROM "group"
+        """
+        await db.execute(
+            insert(Journal).from_select(
+                ["user_id", "task_id", "mark", "comment"],
+                select(Group.user_id, Task.id, literal(0), literal(""))
+                .join(Group, Group.course_id == Task.course_id)
+                .where(Task.id.in_(task_ids))
+            )
+        )
+
     # Функции для всех пользователей
     async def get_task_by_id(self, db: AsyncSession, _id: int) -> Optional[Task]:
         try:
@@ -35,26 +61,47 @@ class TaskService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def get_tasks_by_course_id(self, db: AsyncSession, course_id: int) -> List[Task]:
+    async def get_tasks_by_course_id(self,
+                                     db: AsyncSession,
+                                     course_id: int,
+                                     limit: int = 50,
+                                     cursor: Optional[str] = None,
+                                     statuses: Optional[List[str]] = None) -> List[Task]:
         try:
-            tasks = (
-                await db.scalars(
-                    select(Task)
-                    .where(Task.course_id == course_id)
-                    )
-                ).all()
+            tasks = await self.get_tasks(db, limit=limit, cursor=cursor, course_id=course_id, statuses=statuses)
             self.logger.info(f"(Get tasks by course id) Retrieved {len(tasks)} task from the course with id {course_id}")
             return tasks
         except Exception as e:
             self.logger.error(f"(Get tasks by course id) Error: {e}")
             raise
 
-    async def get_tasks(self, db: AsyncSession, skip: int = 0, limit: int = 50) -> List[Task]:
+    async def get_tasks(self,
+                        db: AsyncSession,
+                        skip: int = 0,
+                        limit: int = 50,
+                        cursor: Optional[str] = None,
+                        course_id: Optional[int] = None,
+                        statuses: Optional[List[str]] = None) -> List[Task]:
+        """
+        Список заданий с фильтрами по курсу и статусам (по умолчанию без удалённых).
+        Фильтр course_id + status + курсор по id обслуживается индексом
+        ix_task_course_id_status_id
+        """
         try:
+            if not statuses:
+                statuses = [status for status in TASK_STATUSES if status != "deleted"]
+
+            query = select(Task).where(Task.status.in_(statuses))
+            if course_id is not None:
+                query = query.where(Task.course_id == course_id)
+
+            query = apply_cursor(query, cursor, Task.id)
+            if not cursor:
+                query = query.offset(skip)
+
             tasks = (
                 await db.scalars(
-                    select(Task)
-                    .offset(skip)
+                    query
                     .limit(limit)
                     )
                 ).all()
@@ -68,25 +115,26 @@ class TaskService:
     
     async def update_task_status(self, db: AsyncSession, task_id: int, status: str) -> Optional[Task]:
         try:
+            if status == "deleted":
+                self.logger.warning(f"(Update task status) Status 'deleted' is set only by deleting task with id {task_id}")
+                return None
+
             task = (
                 await db.scalars(
-                    select(Task)
+                    update(Task)
                     .where(Task.id == task_id)
+                    .where(Task.status.is_distinct_from(status))
+                    .values(status=status)
+                    .returning(Task)
                     )
                 ).first()
 
             if not task:
-                self.logger.warning(f"(Update task status) Task with id {task_id} not found")
+                self.logger.warning(f"(Update task status) Task with id {task_id} not found or has same status")
                 return None
 
-            if task.status != status and status != "deleted":
-                task.status = status
-                await db.commit()
-                await db.refresh(task)
-                self.logger.info(f"(Update task status) Status on task with id {task_id} was update successful")
-            else:
-                self.logger.warning(f"(Update task status) Same status on task with id {task_id}")
-                return None
+            await db.commit()
+            self.logger.info(f"(Update task status) Status on task with id {task_id} was update successful")
             return task
         
         except Exception as e:
@@ -120,6 +168,8 @@ class TaskService:
             )
 
             db.add(task)
+            await db.flush()
+            await self._seed_journal(db, [task.id])
             await db.commit()
             await db.refresh(task)
 
@@ -132,6 +182,47 @@ class TaskService:
             await db.rollback()
             raise
 
+    async def create_tasks(self, db: AsyncSession, tasks_data: List[dict]) -> Optional[List[Task]]:
+        """
+        Массовое создание заданий одним INSERT ... RETURNING
+        """
+        try:
+            if not tasks_data:
+                return []
+
+            course_ids = {task_data["course_id"] for task_data in tasks_data}
+            existing_course_ids = set(
+                (await db.scalars(
+                    select(Course.id)
+                    .where(Course.id.in_(course_ids))
+                )).all()
+            )
+
+            missing_course_ids = course_ids - existing_course_ids
+            if missing_course_ids:
+                self.logger.info(f"(Create tasks) Courses with IDs {sorted(missing_course_ids)} not found")
+                return None
+
+            tasks = (
+                await db.scalars(
+                    insert(Task)
+                    .values(tasks_data)
+                    .returning(Task)
+                    )
+                ).all()
+
+            await self._seed_journal(db, [task.id for task in tasks])
+            await db.commit()
+
+            self.logger.info(f"(Create tasks) {len(tasks)} tasks were successfull created")
+            return tasks
+
+        except Exception as e:
+            self.logger.error(f"(Create tasks) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            await db.rollback()
+            raise
+
     async def update_task(self, 
                           db: AsyncSession,
                           task_id: int, 
@@ -140,17 +231,6 @@ class TaskService:
                           task_status: str,
                           task_course_id: int) -> Optional[Task]:
         try:
-            task = (
-                await db.scalars(
-                    select(Task)
-                    .where(Task.id == task_id)
-                    )
-                ).first()
-
-            if not task:
-                self.logger.warning(f"(Update task) Task with id {task_id} not found")
-                return None
-            
             updates = {
                 "name": task_name,
                 "description": task_description,
@@ -158,20 +238,24 @@ class TaskService:
                 "course_id": task_course_id
             }
 
-            has_changes = any(
-                getattr(task, key) != value for key, value in updates.items()
-            )
-
-            if has_changes:
-                for key, value in updates.items():
-                    setattr(task, key, value)
+            # Отсутствие изменений проверяется в самом UPDATE: строка без
+            # изменений не попадает под WHERE и не возвращается
+            task = (
+                await db.scalars(
+                    update(Task)
+                    .where(Task.id == task_id)
+                    .where(or_(*[getattr(Task, key).is_distinct_from(value) for key, value in updates.items()]))
+                    .values(**updates)
+                    .returning(Task)
+                    )
+                ).first()
 
-                await db.commit()
-                await db.refresh(task)
-                self.logger.info(f"(Update task) Task with id {task_id} was update successfully")
-            else:
-                self.logger.warning(f"(Update task) No updates for task with id {task_id}")
+            if not task:
+                self.logger.warning(f"(Update task) Task with id {task_id} not found or has no updates")
                 return None
+
+            await db.commit()
+            self.logger.info(f"(Update task) Task with id {task_id} was update successfully")
             return task
         
         except Exception as e:
@@ -180,28 +264,75 @@ class TaskService:
             await db.rollback()
             raise
 
+    async def update_tasks_status(self,
+                                  db: AsyncSession,
+                                  course_id: int,
+                                  status: str,
+                                  task_ids: Optional[List[int]] = None,
+                                  from_statuses: Optional[List[str]] = None) -> Optional[List[int]]:
+        """
+        Массовая смена статуса заданий курса одним UPDATE ... RETURNING.
+        Допустимость перехода проверяется в WHERE того же запроса,
+        задания с недопустимым текущим статусом не изменяются.
+        Возвращает ID изменённых заданий или None, если курс не найден
+
+        :raises ValueError: Если в статус status нельзя перейти ни из какого.
+        """
+        try:
+            allowed_statuses = TASK_STATUS_TRANSITIONS.get(status)
+            if not allowed_statuses:
+                raise ValueError(f"Transition to task status '{status}' is not allowed")
+
+            if from_statuses is not None:
+                allowed_statuses = [value for value in allowed_statuses if value in from_statuses]
+
+            query = (
+                update(Task)
+                .where(Task.course_id == course_id)
+                .where(Task.status.in_(allowed_statuses))
+                .values(status=status)
+                .returning(Task.id)
+            )
+            if task_ids is not None:
+                query = query.where(Task.id.in_(task_ids))
+
+            updated_ids = sorted((await db.scalars(query)).all())
+
+            if not updated_ids:
+                course_exists = (await db.scalars(select(Course.id).where(Course.id == course_id))).first()
+                if course_exists is None:
+                    self.logger.warning(f"(Update tasks status) Course with id {course_id} not found")
+                    return None
+
+            await db.commit()
+            self.logger.info(f"(Update tasks status) {len(updated_ids)} tasks of course {course_id} moved to status '{status}'")
+            return updated_ids
+
+        except Exception as e:
+            self.logger.error(f"(Update tasks status) Error: {e}")
+            self.logger.error(traceback.format_exc())
+            await db.rollback()
+            raise
+
     async def delete_status_task(self, db: AsyncSession, task_id: int) -> Optional[Task]:
         try:
             task = (
                 await db.scalars(
-                    select(Task)
+                    update(Task)
                     .where(Task.id == task_id)
+                    .where(Task.status.is_distinct_from("deleted"))
+                    .values(status="deleted")
+                    .returning(Task)
                     )
                 ).first()
 
             if not task:
-                self.logger.warning(f"(Delete status task) Task with id {task_id} not found")
+                self.logger.warning(f"(Delete status task) Task with id {task_id} not found or was already delete")
                 return None
 
-            if task.status != "deleted":
-                task.status = "deleted"
-                await db.commit()
-                await db.refresh(task)
-                self.logger.info(f"(Delete status task) Task with id {task_id} deleted successfully")
-            else:
-                self.logger.warning(f"(Delete status task) Task with id {task_id} was already delete")
-                return None
-            return task     
+            await db.commit()
+            self.logger.info(f"(Delete status task) Task with id {task_id} deleted successfully")
+            return task
         except Exception as e:
             self.logger.error(f"(Delete status task) Error: {e}")
             self.logger.error(traceback.format_exc())
@@ -4,15 +4,20 @@ import traceback
 
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from email_validator import validate_email, EmailNotValidError
 from config import oauth2_scheme, MIN_PASSWORD_LENGTH
 
+from db.pagination import apply_cursor
 from models.tables.user import User
-from services.auth_service import AuthService
+from services.auth_service import AuthService, password_context
 
+# Хэш-заглушка для проверки пароля несуществующего пользователя, чтобы время
+# ответа не выдавало наличие email в базе. Считается один раз при импорте:
+# иначе первый такой вход считал бы bcrypt дважды
+DUMMY_PASSWORD_HASH = password_context.hash(uuid.uuid4().hex)
 
 class UserService:
     def __init__(self):
@@ -63,12 +68,15 @@ class UserService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def get_all_users(self, db: AsyncSession, skip: int = 0, limit: int = 25) -> List[User]:
+    async def get_all_users(self, db: AsyncSession, skip: int = 0, limit: int = 25, cursor: Optional[str] = None) -> List[User]:
         try:
+            query = apply_cursor(select(User), cursor, User.id)
+            if not cursor:
+                query = query.offset(skip)
+
             users = (
                 await db.scalars(
-                    select(User)
-                    .offset(skip)
+                    query
                     .limit(limit)
                 )
             ).all()
@@ -80,26 +88,39 @@ class UserService:
             self.logger.error(traceback.format_exc())
             raise
 
-    async def verify_password(self, db: AsyncSession, email: str, password: str) -> bool:
+    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[Row]:
+        """
+        Проверка логина и пароля одним запросом.
+        Возвращает (id, role) пользователя или None
+        """
         try:
-            user = await self.get_user_by_email(db, email)
+            user = (
+                await db.execute(
+                    select(User.id, User.role, User.password)
+                    .where(User.email == email)
+                )
+            ).first()
 
             if not user:
-                self.logger.info(f"(Password verify) No same user found with email '{email}'")
-                return False
+                await AuthService.verify_hashed_password(password, DUMMY_PASSWORD_HASH)
+                self.logger.info(f"(Authenticate) No same user found with email '{email}'")
+                return None
 
-            if AuthService.verify_hashed_password(password, user.password):
-                self.logger.info(f"(Password verify) Success: {email}")
-                return True
-            else:
-                self.logger.info(f"(Password verify) Failure: {email}")
-                return False
+            if not await AuthService.verify_hashed_password(password, user.password):
+                self.logger.info(f"(Authenticate) Failure: {email}")
+                return None
+
+            self.logger.info(f"(Authenticate) Success: {email}")
+            return user
 
         except Exception as e:
-            self.logger.error(f"(Password verify) Error: {email}")
+            self.logger.error(f"(Authenticate) Error: {email}")
             self.logger.error(traceback.format_exc())
             raise
 
+    async def verify_password(self, db: AsyncSession, email: str, password: str) -> bool:
+        return await self.authenticate(db, email, password) is not None
+
     async def create_user(self, 
                           db: AsyncSession, 
                           name: str,  
@@ -109,7 +130,7 @@ class UserService:
             if len(password) < self.PASSWORD_LENGTH:
                 raise ValueError("Password need to contain more then 8 letters")
 
-            hashed_password = AuthService.get_hashed_password(password)
+            hashed_password = await AuthService.get_hashed_password(password)
 
             validated_email = await self._validate_email(email)
 